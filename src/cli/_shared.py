@@ -0,0 +1,63 @@
+"""Helpers shared by the CLI command modules."""
+
+from collections.abc import Generator
+from functools import cached_property
+
+from sqlmodel import Session
+
+from src.core.db import get_session
+from src.core.models import Periodicity
+
+_PERIODICITY_MAP: dict[str, Periodicity] = {
+    'daily': Periodicity.DAILY,
+    'weekly': Periodicity.WEEKLY,
+}
+
+
+def parse_periodicity(raw: str | None) -> Periodicity | None:
+    """
+    Parse a user-supplied periodicity option (case-insensitive).
+
+    Args:
+        raw: The raw option value, e.g. 'daily' or 'WEEKLY'.
+
+    Returns:
+        The matching Periodicity, or None if no value was given.
+
+    Raises:
+        ValueError: If the value is not 'daily' or 'weekly'.
+    """
+    if not raw:
+        return None
+    periodicity = _PERIODICITY_MAP.get(raw.lower())
+    if periodicity is None:
+        raise ValueError(f'Invalid periodicity: {raw}')
+    return periodicity
+
+
+class SessionCLIContext:
+    """
+    Base context object for CLI commands (services are built on first use).
+
+    Services built from `_session_factory` share one session, opened on first
+    use, so a command's queries run on one connection and one identity map.
+    Register `close` with `ctx.call_on_close` so the session is closed when the
+    command finishes.
+    """
+
+    def __init__(self) -> None:
+        self._session_generator: Generator[Session] | None = None
+
+    @cached_property
+    def session(self) -> Session:
+        self._session_generator = get_session()
+        return next(self._session_generator)
+
+    def _session_factory(self) -> Generator[Session]:
+        yield self.session
+
+    def close(self) -> None:
+        """Close the shared session, if one was opened."""
+        if self._session_generator is not None:
+            self._session_generator.close()
+            self._session_generator = None
@@ -1,21 +1,20 @@
 """Analytics CLI commands."""
 
+from functools import cached_property
+from itertools import chain
 from typing import Annotated
 
 from rich import print
 from rich.console import Console
 from rich.panel import Panel
-from rich.table import Table
 from typer import Context, Exit, Option, Typer
 
+from src.cli._shared import SessionCLIContext, parse_periodicity
 from src.core.analytics import (
-    CompletionDTO,
     HabitDTO,
-    filter_habits_by_periodicity,
     longest_streak_across_habits,
     longest_streak_for_habit,
 )
-from src.core.db import get_session
 from src.core.habit import ActiveProfileRequired, HabitService
 from src.core.models import Periodicity
 
@@ -23,17 +22,19 @@ cli = Typer()
 console = Console()
 
 
-class AnalyticsCLIContext:
+class AnalyticsCLIContext(SessionCLIContext):
     """Context object for analytics CLI commands."""
 
-    def __init__(self) -> None:
-        self.habit_service = HabitService(get_session)
+    @cached_property
+    def habit_service(self) -> HabitService:
+        return HabitService(self._session_factory)
 
 
 @cli.callback()
 def analytics_callback(ctx: Context) -> None:
     """Initialize habit service in context."""
     ctx.obj = AnalyticsCLIContext()
+    ctx.call_on_close(ctx.obj.close)
 
 
 def _habit_to_dto(habit) -> HabitDTO:
@@ -47,15 +48,6 @@ def _habit_to_dto(habit) -> HabitDTO:
     )
 
 
-def _completion_to_dto(completion) -> CompletionDTO:
-    """Convert Completion ORM model to CompletionDTO."""
-    return CompletionDTO(
-        habit_id=completion.habit_id,
-        completed_at=completion.completed_at,
-        period_key=completion.period_key,
-    )
-
-
 @cli.command()
 def habits(
     ctx: Context,
@@ -65,31 +57,29 @@ def habits(
     ] = None,
 ):
     """List all habits with analytics information."""
+    from rich.table import Table
+
     service: HabitService = ctx.obj.habit_service
 
     try:
-        periodicity_enum: Periodicity | None = None
-        if periodicity:
-            periodicity_upper = periodicity.upper()
-            if periodicity_upper not in ['DAILY', 'WEEKLY']:
-                print(
-                    f"[red]Invalid periodicity '{periodicity}'. Must be 'daily' or 'weekly'.[/red]"
-                )
-                raise Exit(code=1)
-            periodicity_enum = Periodicity(periodicity_upper)
+        try:
+            periodicity_enum = parse_periodicity(periodicity)
+        except ValueError:
+            print(
+                f"[red]Invalid periodicity '{periodicity}'. Must be 'daily' or 'weekly'.[/red]"
+            )
+            raise Exit(code=1)
 
-        # Fetch all habits
-        habits_orm = service.list_habits(active_only=False)
+        # Fetch habits, filtering by periodicity in the query
+        habits_orm = service.list_habits(
+            active_only=False, periodicity=periodicity_enum
+        )
         habits_dto = [_habit_to_dto(h) for h in habits_orm]
 
         if not habits_dto:
             print('[yellow]No habits found. Create one with "habit create".[/yellow]')
             return
 
-        # Apply periodicity filter if provided
-        if periodicity_enum:
-            habits_dto = filter_habits_by_periodicity(habits_dto, periodicity_enum)
-
         # Render table
         table = Table(title='Habits')
         table.add_column('ID', justify='right', style='cyan', no_wrap=True)
@@ -98,15 +88,18 @@ def habits(
         table.add_column('Status', justify='center', style='green')
         table.add_column('Created At', justify='right')
 
-        for habit in habits_dto:
-            status = 'Active' if habit.is_active else 'Archived'
-            table.add_row(
+        rows = [
+            (
                 str(habit.id),
                 habit.name,
                 habit.periodicity.value,
-                status,
-                habit.created_at.strftime('%Y-%m-%d %H:%M'),
+                'Active' if habit.is_active else 'Archived',
+                habit.created_at.isoformat(sep=' ', timespec='minutes'),
             )
+            for habit in habits_dto
+        ]
+        for row in rows:
+            table.add_row(*row)
 
         console.print(table)
 
@@ -145,50 +138,24 @@ def longest(
                 )
                 return
 
-        # Fetch completions
-        habit_ids = [h.id for h in habits_orm]
-        completions_orm = service.list_completions(habit_ids=habit_ids)
-        completions_dto = [_completion_to_dto(c) for c in completions_orm]
-
         # Handle specific habit request
         if habit:
-            # Try to resolve habit by ID or name
-            target_habit_dto = None
+            # Try to resolve habit by ID or name (case-insensitive); reversed so
+            # the earliest-created habit wins when names collide
+            by_id = {h.id: h for h in habits_dto}
+            by_name = {h.name.lower(): h for h in reversed(habits_dto)}
             try:
-                habit_id = int(habit)
-                target_habit_dto = next(
-                    (h for h in habits_dto if h.id == habit_id), None
-                )
+                target_habit_dto = by_id.get(int(habit))
             except ValueError:
-                # Not a number, try name match (case-insensitive)
-                habit_name_lower = habit.lower()
-                target_habit_dto = next(
-                    (h for h in habits_dto if h.name.lower() == habit_name_lower), None
-                )
+                target_habit_dto = by_name.get(habit.lower())
 
             if not target_habit_dto:
                 print(f"[red]Habit '{habit}' not found.[/red]")
                 raise Exit(code=1)
 
-            streak = longest_streak_for_habit(target_habit_dto, completions_dto)
-
-            # Show result
-            if completions_dto:
-                periodicity_label = (
-                    'days'
-                    if target_habit_dto.periodicity == Periodicity.DAILY
-                    else 'weeks'
-                )
-                print(
-                    Panel.fit(
-                        f'[bold]Longest Streak:[/bold] {streak} {periodicity_label}\n'
-                        f'[bold]Habit:[/bold] {target_habit_dto.name}\n'
-                        f'[bold]Periodicity:[/bold] {target_habit_dto.periodicity.value}',
-                        title='Streak Information',
-                        border_style='green',
-                    )
-                )
-            else:
+            # Only the target habit's completions are needed for its streak
+            completions_dto = service.list_completions(habit_ids=[target_habit_dto.id])
+            if not completions_dto:
                 print(
                     Panel.fit(
                         f'[bold]Longest Streak:[/bold] 0\n'
@@ -198,23 +165,46 @@ def longest(
                         border_style='yellow',
                     )
                 )
+                return
+
+            streak = longest_streak_for_habit(target_habit_dto, completions_dto)
+
+            periodicity_label = (
+                'days' if target_habit_dto.periodicity == Periodicity.DAILY else 'weeks'
+            )
+            print(
+                Panel.fit(
+                    f'[bold]Longest Streak:[/bold] {streak} {periodicity_label}\n'
+                    f'[bold]Habit:[/bold] {target_habit_dto.name}\n'
+                    f'[bold]Periodicity:[/bold] {target_habit_dto.periodicity.value}',
+                    title='Streak Information',
+                    border_style='green',
+                )
+            )
+            return
+
+        # Stream completions for the active profile (joined on Habit in SQL); the
+        # first row is pulled up front to detect the empty case
+        completions_iter = service.iter_completions()
+        first_completion = next(completions_iter, None)
+        if first_completion is None:
+            print(
+                Panel.fit(
+                    '[bold]Longest Streak:[/bold] 0\n'
+                    '[dim]No completions recorded yet. Complete habits to start building streaks![/dim]',
+                    title='Streak Information',
+                    border_style='yellow',
+                )
+            )
             return
 
         # Show longest streak across all habits
-        result = longest_streak_across_habits(habits_dto, completions_dto)
+        result = longest_streak_across_habits(
+            habits_dto, chain((first_completion,), completions_iter)
+        )
 
         if result.length == 0:
-            if completions_dto:
-                print('[yellow]No streaks found.[/yellow]')
-            else:
-                print(
-                    Panel.fit(
-                        '[bold]Longest Streak:[/bold] 0\n'
-                        '[dim]No completions recorded yet. Complete habits to start building streaks![/dim]',
-                        title='Streak Information',
-                        border_style='yellow',
-                    )
-                )
+            print('[yellow]No streaks found.[/yellow]')
         else:
             periodicity_label = (
                 'days' if result.periodicity == Periodicity.DAILY else 'weeks'
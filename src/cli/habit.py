@@ -1,14 +1,12 @@
+from functools import cached_property
 from typing import Annotated
 
-import questionary
 from rich import print
 from rich.console import Console
 from rich.panel import Panel
-from rich.prompt import Confirm, Prompt
-from rich.table import Table
 from typer import Argument, Context, Exit, Option, Typer
 
-from src.core.db import get_session
+from src.cli._shared import SessionCLIContext, parse_periodicity
 from src.core.habit import (
     ActiveProfileRequired,
     HabitAlreadyCompletedForPeriod,
@@ -17,25 +15,29 @@ from src.core.habit import (
     HabitNotFound,
     HabitService,
 )
-from src.core.models import Periodicity
 from src.core.xp import XPService
 
 cli = Typer()
 console = Console()
 
 
-class HabitCLIContext:
+class HabitCLIContext(SessionCLIContext):
     """Context object for habit CLI commands."""
 
-    def __init__(self) -> None:
-        self.xp_service = XPService(get_session)
-        self.habit_service = HabitService(get_session, xp_service=self.xp_service)
+    @cached_property
+    def xp_service(self) -> XPService:
+        return XPService(self._session_factory)
+
+    @cached_property
+    def habit_service(self) -> HabitService:
+        return HabitService(self._session_factory, xp_service=self.xp_service)
 
 
 @cli.callback()
 def habit_callback(ctx: Context) -> None:
     """Initialize habit service in context."""
     ctx.obj = HabitCLIContext()
+    ctx.call_on_close(ctx.obj.close)
 
 
 @cli.command()
@@ -48,6 +50,9 @@ def create(
     ] = None,
 ):
     """Create a new habit."""
+    import questionary
+    from rich.prompt import Prompt
+
     service: HabitService = ctx.obj.habit_service
 
     print(Panel.fit('Create a New Habit', style='bold blue'))
@@ -77,15 +82,14 @@ def create(
             periodicity = periodicity_choice
 
         # Normalize periodicity
-        periodicity_upper = periodicity.upper()
-        if periodicity_upper not in ['DAILY', 'WEEKLY']:
+        try:
+            periodicity_enum = parse_periodicity(periodicity)
+        except ValueError:
             print(
                 f"[red]Invalid periodicity '{periodicity}'. Must be 'daily' or 'weekly'.[/red]"
             )
             raise Exit(1)
 
-        periodicity_enum = Periodicity(periodicity_upper)
-
         # Create habit
         habit = service.create_habit(name, periodicity_enum)
         print(f"[green]Habit '{habit.name}' created successfully![/green]")
@@ -117,18 +121,18 @@ def list_habits(
     ] = None,
 ):
     """List habits for the active profile."""
+    from rich.table import Table
+
     service: HabitService = ctx.obj.habit_service
 
     try:
-        periodicity_enum = None
-        if periodicity:
-            periodicity_upper = periodicity.upper()
-            if periodicity_upper not in ['DAILY', 'WEEKLY']:
-                print(
-                    f"[red]Invalid periodicity '{periodicity}'. Must be 'daily' or 'weekly'.[/red]"
-                )
-                raise Exit(1)
-            periodicity_enum = Periodicity(periodicity_upper)
+        try:
+            periodicity_enum = parse_periodicity(periodicity)
+        except ValueError:
+            print(
+                f"[red]Invalid periodicity '{periodicity}'. Must be 'daily' or 'weekly'.[/red]"
+            )
+            raise Exit(1)
 
         habits = service.list_habits(active_only=not all, periodicity=periodicity_enum)
 
@@ -150,15 +154,18 @@ def list_habits(
         table.add_column('Status', justify='center', style='green')
         table.add_column('Created At', justify='right')
 
-        for habit in habits:
-            status = 'Active' if habit.is_active else 'Archived'
-            table.add_row(
+        rows = [
+            (
                 str(habit.id),
                 habit.name,
                 habit.periodicity.value,
-                status,
-                habit.created_at.strftime('%Y-%m-%d %H:%M'),
+                'Active' if habit.is_active else 'Archived',
+                habit.created_at.isoformat(sep=' ', timespec='minutes'),
             )
+            for habit in habits
+        ]
+        for row in rows:
+            table.add_row(*row)
 
         console.print(table)
 
@@ -179,6 +186,8 @@ def complete(
     ] = None,
 ):
     """Mark a habit as completed for the current period."""
+    import questionary
+
     service: HabitService = ctx.obj.habit_service
 
     try:
@@ -194,16 +203,15 @@ def complete(
                     )
                     raise Exit(1)
                 habits = all_habits
-                due_habits_set = set()
             else:
                 habits = due_habits
-                due_habits_set = {h.id for h in due_habits}
 
+            # Either every listed habit is due, or (fallback) none of them are
+            all_completed = habits is not due_habits
             choices = []
             for h in habits:
-                is_due = h.id in due_habits_set
                 display_name = f'{h.name} ({h.periodicity.value})'
-                if not is_due:
+                if all_completed:
                     display_name += ' [already completed]'
                 choices.append(questionary.Choice(title=display_name, value=h.id))
 
@@ -216,8 +224,7 @@ def complete(
                 raise Exit()
 
         # Get habit name before completing (for display)
-        all_habits = service.list_habits(active_only=False)
-        habit = next((h for h in all_habits if h.id == habit_id), None)
+        habit = service.get_habit(habit_id)
 
         _, milestone_events = service.complete_habit(habit_id)
 
@@ -229,9 +236,8 @@ def complete(
         # Show XP reward
         try:
             xp_service: XPService = ctx.obj.xp_service
-            _ = xp_service.get_total_xp_for_active_profile()
-            level, xp_into_level, xp_to_next_level = (
-                xp_service.get_level_progress_for_active_profile()
+            _, level, xp_into_level, xp_to_next_level = (
+                xp_service.get_xp_summary_for_active_profile()
             )
             base_xp_line = (
                 f'[dim]+1 XP • Level {level} ({xp_into_level}/{xp_into_level + xp_to_next_level})[/dim]'
@@ -274,6 +280,9 @@ def archive(
     ] = False,
 ):
     """Archive a habit (sets is_active=False, keeps history)."""
+    import questionary
+    from rich.prompt import Confirm
+
     service: HabitService = ctx.obj.habit_service
 
     try:
@@ -298,8 +307,7 @@ def archive(
                 raise Exit()
 
         # Get habit name for confirmation
-        all_habits = service.list_habits(active_only=False)
-        habit = next((h for h in all_habits if h.id == habit_id), None)
+        habit = service.get_habit(habit_id)
         if not habit:
             print(f'[red]Habit {habit_id} not found.[/red]')
             raise Exit(1)
@@ -327,6 +335,8 @@ def archive(
 @cli.command()
 def due(ctx: Context):
     """List habits that are due (not completed for the current period)."""
+    from rich.table import Table
+
     service: HabitService = ctx.obj.habit_service
 
     try:
@@ -344,13 +354,17 @@ def due(ctx: Context):
         table.add_column('Periodicity', justify='center')
         table.add_column('Created At', justify='right')
 
-        for habit in due_habits:
-            table.add_row(
+        rows = [
+            (
                 str(habit.id),
                 habit.name,
                 habit.periodicity.value,
-                habit.created_at.strftime('%Y-%m-%d %H:%M'),
+                habit.created_at.isoformat(sep=' ', timespec='minutes'),
             )
+            for habit in due_habits
+        ]
+        for row in rows:
+            table.add_row(*row)
 
         console.print(table)
         print('\n[dim]Complete a habit with: [cyan]habit complete[/cyan][/dim]')
@@ -1,10 +1,11 @@
+from functools import cached_property
+
 from rich import print
 from rich.console import Console
 from rich.panel import Panel
-from rich.table import Table
 from typer import Context, Typer
 
-from src.core.db import get_session
+from src.cli._shared import SessionCLIContext
 from src.core.habit.service import HabitService
 from src.core.profile import ProfileService
 from src.core.xp import XPService
@@ -13,24 +14,34 @@ cli = Typer()
 console = Console()
 
 
-class OverviewCLIContext:
+class OverviewCLIContext(SessionCLIContext):
     """Context object for overview CLI commands."""
 
-    def __init__(self) -> None:
-        self.profile_service = ProfileService(get_session)
-        self.habit_service = HabitService(get_session)
-        self.xp_service = XPService(get_session)
+    @cached_property
+    def profile_service(self) -> ProfileService:
+        return ProfileService(self._session_factory)
+
+    @cached_property
+    def habit_service(self) -> HabitService:
+        return HabitService(self._session_factory)
+
+    @cached_property
+    def xp_service(self) -> XPService:
+        return XPService(self._session_factory)
 
 
 @cli.callback()
 def overview_callback(ctx: Context) -> None:
     """Initialize services in context."""
     ctx.obj = OverviewCLIContext()
+    ctx.call_on_close(ctx.obj.close)
 
 
 @cli.command()
 def daily(ctx: Context):
     """Show daily snapshot: active profile, due habits, and XP summary."""
+    from rich.table import Table
+
     profile_service: ProfileService = ctx.obj.profile_service
     habit_service: HabitService = ctx.obj.habit_service
     xp_service: XPService = ctx.obj.xp_service
@@ -65,12 +76,12 @@ def daily(ctx: Context):
             table.add_column('Name', style='magenta')
             table.add_column('Periodicity', justify='center')
 
-            for habit in due_habits:
-                table.add_row(
-                    str(habit.id),
-                    habit.name,
-                    habit.periodicity.value,
-                )
+            rows = [
+                (str(habit.id), habit.name, habit.periodicity.value)
+                for habit in due_habits
+            ]
+            for row in rows:
+                table.add_row(*row)
 
             console.print(table)
             print()
@@ -81,9 +92,8 @@ def daily(ctx: Context):
 
     # Show XP summary
     try:
-        total_xp = xp_service.get_total_xp_for_active_profile()
-        level, xp_into_level, xp_to_next_level = (
-            xp_service.get_level_progress_for_active_profile()
+        total_xp, level, xp_into_level, xp_to_next_level = (
+            xp_service.get_xp_summary_for_active_profile()
         )
 
         print('[bold]XP Summary:[/bold]')
@@ -1,31 +1,30 @@
+from functools import cached_property
 from typing import Annotated
 
-import questionary
 from rich import print
 from rich.console import Console
-from rich.panel import Panel
-from rich.prompt import Confirm, Prompt
-from rich.table import Table
 from typer import Argument, Context, Exit, Option, Typer
 
-from src.core.db import get_session
+from src.cli._shared import SessionCLIContext
 from src.core.profile import ProfileAlreadyExists, ProfileNotFound, ProfileService
 
 cli = Typer()
 console = Console()
 
 
-class ProfileCLIContext:
+class ProfileCLIContext(SessionCLIContext):
     """Context object for profile CLI commands."""
 
-    def __init__(self) -> None:
-        self.profile_service = ProfileService(get_session)
+    @cached_property
+    def profile_service(self) -> ProfileService:
+        return ProfileService(self._session_factory)
 
 
 @cli.callback()
 def profile_callback(ctx: Context) -> None:
     """Initialize profile service in context."""
     ctx.obj = ProfileCLIContext()
+    ctx.call_on_close(ctx.obj.close)
 
 
 @cli.command()
@@ -34,6 +33,9 @@ def create(
     username: Annotated[str | None, Argument(help='The username to create')] = None,
 ):
     """Create a new user profile."""
+    from rich.panel import Panel
+    from rich.prompt import Confirm, Prompt
+
     service: ProfileService = ctx.obj.profile_service
 
     print(Panel.fit('Create a New Profile', style='bold blue'))
@@ -48,7 +50,7 @@ def create(
             continue
 
         try:
-            service.create_profile(username)
+            profile = service.create_profile(username)
             break
         except ProfileAlreadyExists:
             print(
@@ -61,7 +63,7 @@ def create(
 
     # Prompt to switch
     if Confirm.ask(f"Do you want to switch to '{username}' now?"):
-        service.switch_active_profile(username)
+        service.switch_active_profile(profile.username)
         print(f"[green]Switched to profile '{username}'.[/green]")
 
     print('\n[bold]Next Steps:[/bold]')
@@ -72,14 +74,12 @@ def create(
 @cli.command('list')
 def list_profiles(ctx: Context):
     """List all available profiles."""
+    from rich.table import Table
+
     service: ProfileService = ctx.obj.profile_service
 
-    profiles = service.list_profiles()
     active_profile = service.get_active_profile()
-
-    if not profiles:
-        print("[yellow]No profiles found. Create one with 'profile create'.[/yellow]")
-        return
+    active_profile_id = active_profile.id if active_profile else None
 
     table = Table(title='User Profiles')
     table.add_column('ID', justify='right', style='cyan', no_wrap=True)
@@ -87,16 +87,19 @@ def list_profiles(ctx: Context):
     table.add_column('Active', justify='center', style='green')
     table.add_column('Created At', justify='right')
 
-    for profile in profiles:
-        is_active = active_profile and active_profile.id == profile.id
-        active_marker = '(*)' if is_active else ''
+    # Rows are added as they are fetched
+    for profile in service.iter_profiles():
         table.add_row(
             str(profile.id),
             profile.username,
-            active_marker,
-            profile.created_at.strftime('%Y-%m-%d %H:%M'),
+            '(*)' if profile.id == active_profile_id else '',
+            profile.created_at.isoformat(sep=' ', timespec='minutes'),
         )
 
+    if not table.row_count:
+        print("[yellow]No profiles found. Create one with 'profile create'.[/yellow]")
+        return
+
     console.print(table)
 
 
@@ -106,6 +109,8 @@ def switch(
     username: Annotated[str | None, Argument(help='The username to switch to')] = None,
 ):
     """Switch the active profile."""
+    import questionary
+
     service: ProfileService = ctx.obj.profile_service
 
     if not username:
@@ -165,6 +170,9 @@ def delete(
     ] = False,
 ):
     """Delete a user profile."""
+    import questionary
+    from rich.prompt import Confirm
+
     service: ProfileService = ctx.obj.profile_service
 
     if not username:
@@ -192,8 +200,7 @@ def delete(
     # Check if profile exists and if it's active (for warning)
     try:
         active_profile = service.get_active_profile()
-        profiles = service.list_profiles()
-        profile = next((p for p in profiles if p.username == username.lower()), None)
+        profile = service.get_profile_by_username(username)
 
         if not profile:
             print(f"[red]Profile '{username}' not found.[/red]")
@@ -1,32 +1,33 @@
+from functools import cached_property
 from typing import Annotated
 
 from rich import print
 from rich.console import Console
-from rich.table import Table
 from sqlmodel import select
 from sqlmodel.sql.expression import desc
 from typer import Context, Exit, Option, Typer
 
-from src.core.db import get_session
-from src.core.habit.service import HabitService
-from src.core.models import XPEvent
+from src.cli._shared import SessionCLIContext
+from src.core.models import Habit, XPEvent
 from src.core.xp import ActiveProfileRequired, XPService
 
 cli = Typer()
 console = Console()
 
 
-class XPCLIContext:
+class XPCLIContext(SessionCLIContext):
     """Context object for XP CLI commands."""
 
-    def __init__(self) -> None:
-        self.xp_service = XPService(get_session)
+    @cached_property
+    def xp_service(self) -> XPService:
+        return XPService(self._session_factory)
 
 
 @cli.callback()
 def xp_callback(ctx: Context) -> None:
     """Initialize XP service in context."""
     ctx.obj = XPCLIContext()
+    ctx.call_on_close(ctx.obj.close)
 
 
 @cli.command()
@@ -35,9 +36,8 @@ def status(ctx: Context):
     service: XPService = ctx.obj.xp_service
 
     try:
-        total_xp = service.get_total_xp_for_active_profile()
-        level, xp_into_level, xp_to_next_level = (
-            service.get_level_progress_for_active_profile()
+        total_xp, level, xp_into_level, xp_to_next_level = (
+            service.get_xp_summary_for_active_profile()
         )
 
         print(f'[bold]Total XP:[/bold] {total_xp}')
@@ -61,14 +61,18 @@ def log(
     ] = 10,
 ):
     """Show recent XP events."""
+    from rich.table import Table
+
     service: XPService = ctx.obj.xp_service
 
     try:
         session = service._get_session()
         profile = service._get_active_profile(session)
 
+        # Fetch the habit name alongside each event for display
         statement = (
-            select(XPEvent)
+            select(XPEvent, Habit.name)
+            .outerjoin(Habit, Habit.id == XPEvent.habit_id)
             .where(XPEvent.profile_id == profile.id)
             .order_by(desc(XPEvent.awarded_at))
             .limit(limit)
@@ -79,26 +83,18 @@ def log(
             print('[yellow]No XP events found.[/yellow]')
             return
 
-        # Get habit names for display
-        habit_service = HabitService(get_session)
-        all_habits = habit_service.list_habits(active_only=False)
-        habit_map = {h.id: h.name for h in all_habits}
-
         table = Table(title='Recent XP Events')
         table.add_column('Date', justify='right', style='cyan')
         table.add_column('Amount', justify='right', style='green')
         table.add_column('Reason', style='magenta')
         table.add_column('Habit', style='yellow')
 
-        for event in events:
-            habit_name = (
-                habit_map.get(event.habit_id, 'N/A') if event.habit_id else 'N/A'
-            )
+        for event, habit_name in events:
             table.add_row(
-                event.awarded_at.strftime('%Y-%m-%d %H:%M'),
+                event.awarded_at.isoformat(sep=' ', timespec='minutes'),
                 f'+{event.amount}',
                 event.reason,
-                habit_name,
+                habit_name or 'N/A',
             )
 
         console.print(table)
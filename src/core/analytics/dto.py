@@ -1,17 +1,16 @@
-"""Pydantic DTOs for analytics operations."""
+"""DTOs for analytics operations."""
 
+from dataclasses import dataclass
 from datetime import datetime
-
-from pydantic import BaseModel, ConfigDict
+from typing import NamedTuple
 
 from src.core.models import Periodicity
 
 
-class HabitDTO(BaseModel):
+@dataclass(frozen=True, slots=True)
+class HabitDTO:
     """Data transfer object for Habit."""
 
-    model_config = ConfigDict(frozen=True)
-
     id: int
     name: str
     periodicity: Periodicity
@@ -19,21 +18,18 @@ class HabitDTO(BaseModel):
     is_active: bool
 
 
-class CompletionDTO(BaseModel):
-    """Data transfer object for Completion."""
-
-    model_config = ConfigDict(frozen=True)
+class CompletionDTO(NamedTuple):
+    """Data transfer object for Completion (a plain tuple, one per completion row)."""
 
     habit_id: int
     completed_at: datetime
     period_key: str
 
 
-class LongestStreakDTO(BaseModel):
+@dataclass(frozen=True, slots=True)
+class LongestStreakDTO:
     """Data transfer object for longest streak result."""
 
-    model_config = ConfigDict(frozen=True)
-
     length: int
     habit_id: int | None
     habit_name: str | None
@@ -1,7 +1,9 @@
 """Pure analytics functions operating on DTOs."""
 
-from collections.abc import Sequence
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Sequence
 from datetime import date
+from functools import lru_cache
 
 from src.core.analytics.dto import CompletionDTO, HabitDTO, LongestStreakDTO
 from src.core.models import Periodicity
@@ -36,33 +38,88 @@ def filter_habits_by_periodicity(
     return [h for h in habits if h.periodicity == periodicity]
 
 
-def _parse_period_key_to_ordinal(period_key: str, periodicity: Periodicity) -> int:
+@lru_cache(maxsize=4096)
+def _daily_key_to_ordinal(period_key: str) -> int:
     """
-    Parse a period key into an integer timeline index (ordinal).
+    Parse a DAILY period key (YYYY-MM-DD) into the ordinal of that day.
+
+    Args:
+        period_key: Period key string in YYYY-MM-DD format.
+
+    Returns:
+        Integer ordinal of the day.
+    """
+    return date.fromisoformat(period_key).toordinal()
+
+
+@lru_cache(maxsize=4096)
+def _weekly_key_to_ordinal(period_key: str) -> int:
+    """
+    Parse a WEEKLY period key (YYYY-Www) into the ordinal of that week's Monday.
+
+    Args:
+        period_key: Period key string in YYYY-Www format.
+
+    Returns:
+        Integer ordinal of the Monday of the ISO week.
+    """
+    year_str, week_str = period_key.split('-W')
+    return date.fromisocalendar(int(year_str), int(week_str), 1).toordinal()
+
+
+def _get_period_key_parser(periodicity: Periodicity) -> Callable[[str], int]:
+    """
+    Get the period key parser for a periodicity.
 
     Args:
-        period_key: Period key string (YYYY-MM-DD for DAILY, YYYY-Www for WEEKLY).
         periodicity: Periodicity type.
 
     Returns:
-        Integer ordinal representing the period.
+        Function mapping a period key to its integer ordinal.
     """
     if periodicity == Periodicity.DAILY:
-        # Parse YYYY-MM-DD and convert to ordinal
-        period_date = date.fromisoformat(period_key)
-        return period_date.toordinal()
+        return _daily_key_to_ordinal
     elif periodicity == Periodicity.WEEKLY:
-        # Parse YYYY-Www and convert to ordinal of the Monday of that week
-        year_str, week_str = period_key.split('-W')
-        year = int(year_str)
-        week = int(week_str)
-        # Get the Monday of the ISO week
-        monday = date.fromisocalendar(year, week, 1)
-        return monday.toordinal()
+        return _weekly_key_to_ordinal
     else:
         raise ValueError(f'Unknown periodicity: {periodicity}')
 
 
+def _parse_period_keys_to_ordinals(
+    period_keys: Iterable[str], periodicity: Periodicity
+) -> set[int]:
+    """
+    Parse a batch of period keys into a set of distinct ordinals.
+
+    The parser is resolved once for the whole batch and each distinct key is
+    parsed once; invalid keys are skipped.
+
+    Args:
+        period_keys: Period key strings sharing the same periodicity.
+        periodicity: Periodicity type.
+
+    Returns:
+        Set of distinct ordinals.
+    """
+    parse = _get_period_key_parser(periodicity)
+    distinct_keys = set(period_keys)
+
+    try:
+        return set(map(parse, distinct_keys))
+    except (ValueError, KeyError):
+        # Fall back to key-by-key parsing, skipping invalid period keys
+        pass
+
+    ordinals: set[int] = set()
+    for period_key in distinct_keys:
+        try:
+            ordinals.add(parse(period_key))
+        except (ValueError, KeyError):
+            continue
+
+    return ordinals
+
+
 def _get_consecutive_step(periodicity: Periodicity) -> int:
     """
     Get the step size for consecutive periods.
@@ -81,67 +138,82 @@ def _get_consecutive_step(periodicity: Periodicity) -> int:
         raise ValueError(f'Unknown periodicity: {periodicity}')
 
 
-def longest_streak_for_habit(
-    habit: HabitDTO, completions: Sequence[CompletionDTO]
-) -> int:
+def _longest_run(sorted_ordinals: Sequence[int], step: int) -> int:
     """
-    Calculate the longest streak for a specific habit.
+    Find the longest run of ordinals spaced exactly `step` apart.
 
     Args:
-        habit: The habit DTO.
-        completions: Sequence of completion DTOs (will be filtered by habit_id).
+        sorted_ordinals: Non-empty, strictly increasing sequence of ordinals.
+        step: Distance between two consecutive periods.
 
     Returns:
-        Length of the longest streak (0 if no completions).
+        Length of the longest consecutive run.
     """
-    # Filter completions for this habit
-    habit_completions = [c for c in completions if c.habit_id == habit.id]
+    max_run = current = 1
+    previous = sorted_ordinals[0]
+
+    for ordinal in sorted_ordinals[1:]:
+        if ordinal == previous + step:
+            current += 1
+            if current > max_run:
+                max_run = current
+        else:
+            current = 1
+        previous = ordinal
+
+    return max_run
 
-    if not habit_completions:
-        return 0
 
+def _streak_from_period_keys(
+    period_keys: Iterable[str], periodicity: Periodicity
+) -> int:
+    """
+    Calculate the longest streak over the period keys of a single habit.
+
+    Args:
+        period_keys: Period key strings of one habit's completions.
+        periodicity: Periodicity type of the habit.
+
+    Returns:
+        Length of the longest streak (0 if no valid period keys).
+    """
     # Parse period keys to ordinals and deduplicate
-    period_ordinals = set()
-    for completion in habit_completions:
-        try:
-            ordinal = _parse_period_key_to_ordinal(
-                completion.period_key, habit.periodicity
-            )
-            period_ordinals.add(ordinal)
-        except (ValueError, KeyError):
-            # Skip invalid period keys
-            continue
+    period_ordinals = _parse_period_keys_to_ordinals(period_keys, periodicity)
 
     if not period_ordinals:
         return 0
 
-    # Sort ordinals
-    sorted_ordinals = sorted(period_ordinals)
-    step = _get_consecutive_step(habit.periodicity)
+    return _longest_run(sorted(period_ordinals), _get_consecutive_step(periodicity))
 
-    # Find the longest consecutive run
-    max_streak = 1
-    current_streak = 1
 
-    for i in range(1, len(sorted_ordinals)):
-        if sorted_ordinals[i] == sorted_ordinals[i - 1] + step:
-            current_streak += 1
-            max_streak = max(max_streak, current_streak)
-        else:
-            current_streak = 1
+def longest_streak_for_habit(
+    habit: HabitDTO, completions: Sequence[CompletionDTO]
+) -> int:
+    """
+    Calculate the longest streak for a specific habit.
 
-    return max_streak
+    Args:
+        habit: The habit DTO.
+        completions: Sequence of completion DTOs (will be filtered by habit_id).
+
+    Returns:
+        Length of the longest streak (0 if no completions).
+    """
+    return _streak_from_period_keys(
+        (c.period_key for c in completions if c.habit_id == habit.id),
+        habit.periodicity,
+    )
 
 
 def longest_streak_across_habits(
-    habits: Sequence[HabitDTO], completions: Sequence[CompletionDTO]
+    habits: Sequence[HabitDTO], completions: Iterable[CompletionDTO]
 ) -> LongestStreakDTO:
     """
     Find the longest streak across all habits.
 
     Args:
         habits: Sequence of habit DTOs.
-        completions: Sequence of completion DTOs.
+        completions: Iterable of completion DTOs (consumed in a single pass).
 
     Returns:
         LongestStreakDTO with the best streak information.
@@ -152,18 +224,36 @@ def longest_streak_across_habits(
             length=0, habit_id=None, habit_name=None, periodicity=None
         )
 
+    # Bucket period keys by habit in a single pass over the completions
+    period_keys_by_habit: defaultdict[int, list[str]] = defaultdict(list)
+    for completion in completions:
+        period_keys_by_habit[completion.habit_id].append(completion.period_key)
+
+    # Scan habits with the most completions first: a habit's streak can't exceed
+    # its completion count, so once that count drops below the best streak no
+    # remaining habit can win
+    candidates = sorted(
+        (
+            (period_keys, habit)
+            for habit in habits
+            if (period_keys := period_keys_by_habit.get(habit.id))
+        ),
+        key=lambda candidate: len(candidate[0]),
+        reverse=True,
+    )
+
     best_streak = 0
     best_habit: HabitDTO | None = None
 
-    for habit in habits:
-        streak = longest_streak_for_habit(habit, completions)
-        if streak > best_streak:
+    for period_keys, habit in candidates:
+        if len(period_keys) < best_streak:
+            break
+
+        streak = _streak_from_period_keys(period_keys, habit.periodicity)
+        # Rank by streak, breaking ties on the lower habit_id for determinism
+        if best_habit is None or (streak, -habit.id) > (best_streak, -best_habit.id):
             best_streak = streak
             best_habit = habit
-        elif streak == best_streak and best_habit is not None:
-            # Tie-breaking: prefer lower habit_id for determinism
-            if habit.id < best_habit.id:
-                best_habit = habit
 
     if best_habit is None or best_streak == 0:
         return LongestStreakDTO(
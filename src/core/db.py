@@ -1,17 +1,49 @@
 from collections.abc import Generator
+from functools import cache
 
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlmodel import Session, SQLModel, create_engine
 
 from .config import app_settings
 from .models import AppState, Completion, Habit, Profile, XPEvent  # noqa: F401
 
-engine = create_engine(app_settings.DATABASE_URL, echo=app_settings.DEBUG)
+_url = make_url(app_settings.DATABASE_URL)
+# In-memory SQLite uses SingletonThreadPool, which has no LIFO option
+_in_memory = _url.get_backend_name() == 'sqlite' and _url.database in (
+    None,
+    '',
+    ':memory:',
+)
 
+engine = create_engine(
+    _url,
+    echo=app_settings.DEBUG,
+    **({} if _in_memory else {'pool_use_lifo': True}),
+)
 
+
+if _url.get_backend_name() == 'sqlite':
+
+    @event.listens_for(engine, 'connect')
+    def _set_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+        # WAL with synchronous=NORMAL avoids an fsync on every commit while
+        # staying durable across application crashes
+        cursor = dbapi_connection.cursor()
+        if not _in_memory:
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute('PRAGMA temp_store=MEMORY')
+        cursor.close()
+
+
+@cache
 def init_db() -> None:
     SQLModel.metadata.create_all(engine)
 
 
 def get_session() -> Generator[Session]:
-    with Session(engine) as session:
+    # Objects are fully populated on flush (all defaults are client-side), so
+    # expiring them on commit would only force reload SELECTs
+    with Session(engine, expire_on_commit=False) as session:
         yield session
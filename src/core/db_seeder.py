@@ -5,7 +5,7 @@ from datetime import datetime, timedelta
 
 from sqlmodel import Session
 
-from src.core.db import engine
+from src.core.db import engine, init_db
 from src.core.habit.service import HabitService
 from src.core.habit.errors import HabitAlreadyExists, HabitAlreadyCompletedForPeriod
 from src.core.models import Periodicity
@@ -25,6 +25,7 @@ def seed_db(progress_callback: Callable[[str], None] | None = None) -> None:
         if progress_callback:
             progress_callback(message)
 
+    init_db()
     with Session(engine) as session:
         session_factory = lambda: iter([session])
 
@@ -38,8 +39,7 @@ def seed_db(progress_callback: Callable[[str], None] | None = None) -> None:
         try:
             primary_profile = profile_service.create_profile('Primary')
         except ProfileAlreadyExists:
-            profiles = profile_service.list_profiles()
-            primary_profile = next((p for p in profiles if p.username == 'primary'), None)
+            primary_profile = profile_service.get_profile_by_username('Primary')
             if not primary_profile:
                 raise RuntimeError('Primary profile should exist but was not found')
 
@@ -47,8 +47,7 @@ def seed_db(progress_callback: Callable[[str], None] | None = None) -> None:
         try:
             _ = profile_service.create_profile('Test')
         except ProfileAlreadyExists:
-            profiles = profile_service.list_profiles()
-            if not next((p for p in profiles if p.username == 'test'), None):
+            if not profile_service.get_profile_by_username('Test'):
                 raise RuntimeError('Test profile should exist but was not found')
 
         # Set Primary as active profile for seeding
@@ -1,9 +1,11 @@
 """Habit service for managing habits and completions."""
 
-from collections.abc import Callable, Generator
+from collections.abc import Callable, Generator, Iterator
 from datetime import datetime
+from sys import intern
 from typing import TYPE_CHECKING
 
+from sqlalchemy import and_, case
 from sqlmodel import Session, select
 from sqlmodel.sql.expression import col
 
@@ -79,11 +81,12 @@ class HabitService:
         Raises:
             ActiveProfileRequired: If no profile is active.
         """
-        state = session.get(AppState, 1)
-        if not state or not state.active_profile_id:
-            raise ActiveProfileRequired()
-
-        profile = session.get(Profile, state.active_profile_id)
+        statement = (
+            select(Profile)
+            .join(AppState, AppState.active_profile_id == Profile.id)
+            .where(AppState.id == 1)
+        )
+        profile = session.exec(statement).first()
         if not profile:
             raise ActiveProfileRequired()
 
@@ -165,6 +168,28 @@ class HabitService:
 
         return list(session.exec(statement.order_by(Habit.created_at)).all())
 
+    def get_habit(self, habit_id: int) -> Habit | None:
+        """
+        Get a single habit of the active profile by ID.
+
+        Args:
+            habit_id: The ID of the habit to fetch.
+
+        Returns:
+            The Habit instance, or None if it doesn't exist or belongs to another profile.
+
+        Raises:
+            ActiveProfileRequired: If no profile is active.
+        """
+        session = self._get_session()
+        profile = self._get_active_profile(session)
+
+        habit = session.get(Habit, habit_id)
+        if not habit or habit.profile_id != profile.id:
+            return None
+
+        return habit
+
     def archive_habit(self, habit_id: int) -> Habit:
         """
         Archive a habit by setting is_active=False.
@@ -244,20 +269,26 @@ class HabitService:
             period_key=period_key,
         )
         session.add(completion)
-        session.commit()
-        session.refresh(completion)
+        # Flush to assign the completion ID; the completion and its XP events
+        # are committed together below
+        session.flush()
 
         milestone_events: list[XPEvent] = []
 
         # Award XP if service is available
         if self._xp_service:
             self._xp_service.award_habit_completion(
-                session, profile.id, habit_id, completion.id
+                session, profile.id, habit_id, completion.id, commit=False
             )
-            session.commit()
 
-            # Compute streak and award milestone XP for eligible targets
-            completions = self.list_completions(habit_ids=[habit_id])
+            # Compute streak and award milestone XP for eligible targets; read on
+            # this session so the flushed (uncommitted) completion is counted
+            rows = session.exec(
+                select(
+                    Completion.habit_id, Completion.completed_at, Completion.period_key
+                ).where(Completion.habit_id == habit_id)
+            )
+            completions = [CompletionDTO(*row) for row in rows]
             habit_dto = HabitDTO(
                 id=habit.id,
                 name=habit.name,
@@ -265,20 +296,12 @@ class HabitService:
                 created_at=habit.created_at,
                 is_active=habit.is_active,
             )
-            completion_dtos = [
-                CompletionDTO(
-                    habit_id=c.habit_id,
-                    completed_at=c.completed_at,
-                    period_key=c.period_key,
-                )
-                for c in completions
-            ]
-            streak = longest_streak_for_habit(habit_dto, completion_dtos)
+            streak = longest_streak_for_habit(habit_dto, completions)
             milestone_events = self._xp_service.award_milestone_xp(
-                session, profile.id, habit_id, streak
+                session, profile.id, habit_id, streak, commit=False
             )
-            if milestone_events:
-                session.commit()
+
+        session.commit()
 
         return (completion, milestone_events)
 
@@ -301,30 +324,38 @@ class HabitService:
         if when is None:
             when = datetime.now()
 
-        # Query active habits directly within the same session
-        statement = select(Habit).where(
-            Habit.profile_id == profile.id,
-            Habit.is_active == True,  # noqa: E712
+        # Match each habit against the completion for its current period; habits
+        # without a matching completion are due
+        current_period_key = case(
+            *(
+                (
+                    Habit.periodicity == periodicity,
+                    _compute_period_key(when, periodicity),
+                )
+                for periodicity in Periodicity
+            )
         )
-        active_habits = list(session.exec(statement.order_by(Habit.created_at)).all())
-
-        due_habits = []
-        for habit in active_habits:
-            period_key = _compute_period_key(when, habit.periodicity)
-
-            # Check if there's a completion for this period
-            statement = select(Completion).where(
-                Completion.habit_id == habit.id,
-                Completion.period_key == period_key,
+        statement = (
+            select(Habit)
+            .outerjoin(
+                Completion,
+                and_(
+                    Completion.habit_id == Habit.id,
+                    Completion.period_key == current_period_key,
+                ),
             )
-            existing = session.exec(statement).first()
-
-            if not existing:
-                due_habits.append(habit)
-
-        return due_habits
+            .where(
+                Habit.profile_id == profile.id,
+                Habit.is_active == True,  # noqa: E712
+                col(Completion.id).is_(None),
+            )
+            .order_by(Habit.created_at)
+        )
+        return list(session.exec(statement).all())
 
-    def list_completions(self, habit_ids: list[int] | None = None) -> list[Completion]:
+    def list_completions(
+        self, habit_ids: list[int] | None = None
+    ) -> list[CompletionDTO]:
         """
         List completions for the active profile, optionally filtered by habit IDs.
 
@@ -333,17 +364,40 @@ class HabitService:
                       completions for the active profile.
 
         Returns:
-            A list of Completion instances for the active profile.
+            A list of CompletionDTO tuples for the active profile.
 
         Raises:
             ActiveProfileRequired: If no profile is active.
         """
+        return list(self.iter_completions(habit_ids))
+
+    def iter_completions(
+        self, habit_ids: list[int] | None = None
+    ) -> Iterator[CompletionDTO]:
+        """
+        Iterate over completions for the active profile without materializing them.
+
+        Only the columns needed for analytics are selected, so rows are yielded
+        as CompletionDTOs without hydrating Completion ORM instances. Rows are
+        fetched from the database in batches as the iterator is consumed.
+
+        Args:
+            habit_ids: Optional list of habit IDs to filter by. If None, yields all
+                      completions for the active profile.
+
+        Returns:
+            An iterator of CompletionDTO tuples ordered by completion time.
+
+        Raises:
+            ActiveProfileRequired: If no profile is active (raised on call, not
+                                   on first iteration).
+        """
         session = self._get_session()
         profile = self._get_active_profile(session)
 
         # Join Completion → Habit and filter by profile_id
         statement = (
-            select(Completion)
+            select(Completion.habit_id, Completion.completed_at, Completion.period_key)
             .join(Habit, Completion.habit_id == Habit.id)
             .where(Habit.profile_id == profile.id)
         )
@@ -351,4 +405,14 @@ class HabitService:
         if habit_ids is not None:
             statement = statement.where(col(Completion.habit_id).in_(habit_ids))
 
-        return list(session.exec(statement.order_by(Completion.completed_at)).all())
+        rows = session.exec(
+            statement.order_by(Completion.completed_at).execution_options(
+                yield_per=1000
+            )
+        )
+        # Period keys repeat across habits (same day/week), so intern them to
+        # share one string object per key
+        return (
+            CompletionDTO(habit_id, completed_at, intern(period_key))
+            for habit_id, completed_at, period_key in rows
+        )
@@ -1,7 +1,7 @@
 from datetime import datetime
 from enum import Enum
 
-from sqlmodel import Field, SQLModel, UniqueConstraint
+from sqlmodel import Field, Index, SQLModel, UniqueConstraint
 
 
 class Periodicity(str, Enum):
@@ -33,18 +33,19 @@ class Habit(SQLModel, table=True):
 
 class Completion(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
-    habit_id: int = Field(foreign_key='habit.id', index=True)
+    habit_id: int = Field(foreign_key='habit.id')
     completed_at: datetime = Field(default_factory=datetime.now)
     period_key: str
 
     __table_args__ = (
+        # Its backing index also serves habit_id-only lookups (leftmost prefix)
         UniqueConstraint('habit_id', 'period_key', name='unique_habit_period'),
     )
 
 
 class XPEvent(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
-    profile_id: int = Field(foreign_key='profile.id', index=True)
+    profile_id: int = Field(foreign_key='profile.id')
     amount: int = Field(gt=0)
     reason: str
     awarded_at: datetime = Field(default_factory=datetime.now)
@@ -52,3 +53,10 @@ class XPEvent(SQLModel, table=True):
     completion_id: int | None = Field(
         default=None, foreign_key='completion.id', unique=True
     )
+
+    __table_args__ = (
+        # Serves the newest-first per-profile listing used by `xp log`
+        Index('ix_xpevent_profile_id_awarded_at', 'profile_id', 'awarded_at'),
+        # Covers the per-profile SUM(amount) without touching the table
+        Index('ix_xpevent_profile_id_amount', 'profile_id', 'amount'),
+    )
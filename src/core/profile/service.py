@@ -1,6 +1,6 @@
 """Profile service for managing user profiles and active profile state."""
 
-from collections.abc import Callable, Generator
+from collections.abc import Callable, Generator, Iterator
 
 from sqlmodel import Session, select
 
@@ -8,6 +8,22 @@ from src.core.models import AppState, Profile
 from src.core.profile.errors import ProfileAlreadyExists, ProfileNotFound
 
 
+def _normalize_username(username: str) -> str:
+    """
+    Normalize a username for storage and lookup.
+
+    Usernames are stored lowercase, so every comparison goes through this one
+    place and can be matched with a plain equality on the indexed column.
+
+    Args:
+        username: The username as entered by the user.
+
+    Returns:
+        The normalized username.
+    """
+    return username.lower()
+
+
 class ProfileService:
     """Service for profile management operations."""
 
@@ -39,13 +55,13 @@ class ProfileService:
             ProfileAlreadyExists: If a profile with the given username already exists.
         """
         session = self._get_session()
-        normalized_username = username.lower()
+        normalized_username = _normalize_username(username)
 
-        # Check if profile already exists
-        statement = select(Profile).where(Profile.username == normalized_username)
-        existing = session.exec(statement).first()
+        # Check if profile already exists (only the id is fetched)
+        statement = select(Profile.id).where(Profile.username == normalized_username)
+        existing_id = session.exec(statement).first()
 
-        if existing:
+        if existing_id is not None:
             raise ProfileAlreadyExists(normalized_username)
 
         # Create profile
@@ -66,6 +82,33 @@ class ProfileService:
         session = self._get_session()
         return list(session.exec(select(Profile)).all())
 
+    def iter_profiles(self) -> Iterator[Profile]:
+        """
+        Iterate over all available profiles without materializing them in a list.
+
+        Rows are fetched from the database in batches as the iterator is consumed.
+
+        Returns:
+            An iterator of Profile instances.
+        """
+        session = self._get_session()
+        yield from session.exec(select(Profile).execution_options(yield_per=128))
+
+    def get_profile_by_username(self, username: str) -> Profile | None:
+        """
+        Get a single profile by username.
+
+        Args:
+            username: The username to look up (case-insensitive).
+
+        Returns:
+            The Profile instance, or None if no profile with that username exists.
+        """
+        session = self._get_session()
+        return session.exec(
+            select(Profile).where(Profile.username == _normalize_username(username))
+        ).first()
+
     def get_active_profile(self) -> Profile | None:
         """
         Get the currently active profile.
@@ -74,10 +117,12 @@ class ProfileService:
             The active Profile instance, or None if no profile is active.
         """
         session = self._get_session()
-        state = session.get(AppState, 1)
-        if state and state.active_profile_id:
-            return session.get(Profile, state.active_profile_id)
-        return None
+        statement = (
+            select(Profile)
+            .join(AppState, AppState.active_profile_id == Profile.id)
+            .where(AppState.id == 1)
+        )
+        return session.exec(statement).first()
 
     def switch_active_profile(self, username: str) -> Profile:
         """
@@ -93,7 +138,7 @@ class ProfileService:
             ProfileNotFound: If no profile with the given username exists.
         """
         session = self._get_session()
-        normalized_username = username.lower()
+        normalized_username = _normalize_username(username)
 
         profile = session.exec(
             select(Profile).where(Profile.username == normalized_username)
@@ -102,14 +147,13 @@ class ProfileService:
         if not profile:
             raise ProfileNotFound(normalized_username)
 
-        # Update or create AppState
+        # Update or create AppState (an existing row is already tracked by the session)
         state = session.get(AppState, 1)
         if not state:
             state = AppState(id=1, active_profile_id=profile.id)
             session.add(state)
         else:
             state.active_profile_id = profile.id
-            session.add(state)
         session.commit()
 
         return profile
@@ -127,24 +171,22 @@ class ProfileService:
             ProfileNotFound: If no profile with the given username exists.
         """
         session = self._get_session()
-        normalized_username = username.lower()
+        normalized_username = _normalize_username(username)
 
-        profile = session.exec(
-            select(Profile).where(Profile.username == normalized_username)
-        ).first()
+        # Do all reads and mutations first, then flush everything in one commit
+        with session.no_autoflush:
+            profile = session.exec(
+                select(Profile).where(Profile.username == normalized_username)
+            ).first()
 
-        if not profile:
-            raise ProfileNotFound(normalized_username)
+            if not profile:
+                raise ProfileNotFound(normalized_username)
 
-        # Check if this is the active profile
-        state = session.get(AppState, 1)
-        is_active = state and state.active_profile_id == profile.id
-
-        # If deleting active profile, clear state
-        if is_active:
-            if state:
+            # If deleting the active profile, clear state
+            state = session.get(AppState, 1)
+            if state and state.active_profile_id == profile.id:
                 state.active_profile_id = None
-                session.add(state)
 
-        session.delete(profile)
+            session.delete(profile)
+
         session.commit()
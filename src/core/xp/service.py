@@ -1,13 +1,17 @@
 """XP service for managing experience points and levels."""
 
 from collections.abc import Callable, Generator
-from math import floor
 
+from sqlalchemy.dialects.sqlite import insert
 from sqlmodel import Session, func, select
 
 from src.core.models import AppState, Profile, XPEvent
 from src.core.xp.errors import ActiveProfileRequired
 
+# Every habit completion is worth +1 XP, awarded at most once per completion
+HABIT_COMPLETION_XP: int = 1
+HABIT_COMPLETION_REASON: str = 'HABIT_COMPLETION'
+
 # Milestone streak targets (inclusive) - user gets +5 XP once per target per habit
 MILESTONE_STREAK_TARGETS: tuple[int, ...] = (3, 7, 14, 30)
 MILESTONE_BONUS_XP: int = 5
@@ -43,18 +47,25 @@ class XPService:
         Raises:
             ActiveProfileRequired: If no profile is active.
         """
-        state = session.get(AppState, 1)
-        if not state or not state.active_profile_id:
-            raise ActiveProfileRequired()
-
-        profile = session.get(Profile, state.active_profile_id)
+        statement = (
+            select(Profile)
+            .join(AppState, AppState.active_profile_id == Profile.id)
+            .where(AppState.id == 1)
+        )
+        profile = session.exec(statement).first()
         if not profile:
             raise ActiveProfileRequired()
 
         return profile
 
     def award_habit_completion(
-        self, session: Session, profile_id: int, habit_id: int, completion_id: int
+        self,
+        session: Session,
+        profile_id: int,
+        habit_id: int,
+        completion_id: int,
+        *,
+        commit: bool = True,
     ) -> XPEvent:
         """
         Award XP for a habit completion (idempotent).
@@ -64,29 +75,38 @@ class XPService:
             profile_id: The ID of the profile receiving XP.
             habit_id: The ID of the habit that was completed.
             completion_id: The ID of the completion (used for idempotency).
+            commit: Whether to commit the new event. When False it is written
+                    but left to the caller's transaction to commit.
 
         Returns:
             The XPEvent instance (existing or newly created).
         """
-        # Check if XP already awarded for this completion
-        existing = session.exec(
-            select(XPEvent).where(XPEvent.completion_id == completion_id)
-        ).first()
-
-        if existing:
-            return existing
-
-        # Award XP
-        xp_event = XPEvent(
+        # Let the unique completion_id constraint enforce idempotency, so a new
+        # award costs a single INSERT ... RETURNING statement. The values come
+        # from a transient model so its defaults (e.g. awarded_at) apply.
+        new_event = XPEvent(
             profile_id=profile_id,
-            amount=1,
-            reason='HABIT_COMPLETION',
+            amount=HABIT_COMPLETION_XP,
+            reason=HABIT_COMPLETION_REASON,
             habit_id=habit_id,
             completion_id=completion_id,
         )
-        session.add(xp_event)
-        session.commit()
-        session.refresh(xp_event)
+        statement = (
+            insert(XPEvent)
+            .values(new_event.model_dump(exclude={'id'}))
+            .on_conflict_do_nothing(index_elements=['completion_id'])
+            .returning(XPEvent)
+        )
+        xp_event = session.scalars(statement).first()
+
+        if xp_event is None:
+            # Already awarded for this completion
+            return session.exec(
+                select(XPEvent).where(XPEvent.completion_id == completion_id)
+            ).one()
+
+        if commit:
+            session.commit()
 
         return xp_event
 
@@ -96,6 +116,8 @@ class XPService:
         profile_id: int,
         habit_id: int,
         streak_length: int,
+        *,
+        commit: bool = True,
     ) -> list[XPEvent]:
         """
         Award milestone XP for streak targets reached (idempotent per habit/target).
@@ -105,6 +127,8 @@ class XPService:
             profile_id: The ID of the profile receiving XP.
             habit_id: The ID of the habit that reached the streak.
             streak_length: Current longest streak for the habit.
+            commit: Whether to commit the new events. When False they are only
+                    flushed, leaving the commit to the caller's transaction.
 
         Returns:
             List of newly created XPEvent instances (empty if no new milestones).
@@ -135,10 +159,17 @@ class XPService:
                 completion_id=None,
             )
             session.add(xp_event)
-            session.commit()
-            session.refresh(xp_event)
             newly_awarded.append(xp_event)
 
+        if not newly_awarded:
+            return newly_awarded
+
+        # All newly reached targets are written in a single transaction
+        if commit:
+            session.commit()
+        else:
+            session.flush()
+
         return newly_awarded
 
     def get_total_xp(self, session: Session, profile_id: int) -> int:
@@ -152,17 +183,18 @@ class XPService:
         Returns:
             The total XP (0 if no events exist).
         """
-        result = session.exec(
-            select(func.sum(XPEvent.amount)).where(XPEvent.profile_id == profile_id)
-        ).one()
-
-        return int(result) if result is not None else 0
+        # COALESCE turns the NULL sum of an empty set into 0 in SQL
+        return session.scalar(
+            select(func.coalesce(func.sum(XPEvent.amount), 0)).where(
+                XPEvent.profile_id == profile_id
+            )
+        )
 
     def compute_level(self, total_xp: int) -> int:
         """
         Compute the level from total XP.
 
-        Formula: level = 1 + floor(total_xp / 10)
+        Formula: level = 1 + total_xp // 10
 
         Args:
             total_xp: The total XP amount.
@@ -170,7 +202,7 @@ class XPService:
         Returns:
             The computed level.
         """
-        return 1 + floor(total_xp / 10)
+        return 1 + total_xp // 10
 
     def compute_level_progress(self, total_xp: int) -> tuple[int, int, int]:
         """
@@ -182,11 +214,10 @@ class XPService:
         Returns:
             A tuple of (level, xp_into_level, xp_to_next_level).
         """
-        level = self.compute_level(total_xp)
-        xp_into_level = total_xp % 10
+        completed_levels, xp_into_level = divmod(total_xp, 10)
         xp_to_next_level = 10 - xp_into_level
 
-        return (level, xp_into_level, xp_to_next_level)
+        return (1 + completed_levels, xp_into_level, xp_to_next_level)
 
     def get_total_xp_for_active_profile(self) -> int:
         """
@@ -216,3 +247,18 @@ class XPService:
         profile = self._get_active_profile(session)
         total_xp = self.get_total_xp(session, profile.id)
         return self.compute_level_progress(total_xp)
+
+    def get_xp_summary_for_active_profile(self) -> tuple[int, int, int, int]:
+        """
+        Convenience method to get total XP and level progress in a single lookup.
+
+        Returns:
+            A tuple of (total_xp, level, xp_into_level, xp_to_next_level).
+
+        Raises:
+            ActiveProfileRequired: If no profile is active.
+        """
+        session = self._get_session()
+        profile = self._get_active_profile(session)
+        total_xp = self.get_total_xp(session, profile.id)
+        return (total_xp, *self.compute_level_progress(total_xp))
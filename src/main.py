@@ -2,7 +2,7 @@ from typing import Annotated
 
 from rich import print
 from rich.console import Console
-from typer import Exit, Option, Typer
+from typer import Context, Exit, Option, Typer
 
 from src.cli.analytics import cli as analytics_cli
 from src.cli.habit import cli as habit_cli
@@ -36,6 +36,7 @@ def version_callback(value: bool) -> bool:
 
 @app.callback()
 def main(
+    ctx: Context,
     version: Annotated[  # noqa: ARG001
         bool | None,
         Option(
@@ -47,7 +48,10 @@ def main(
         ),
     ] = None,
 ):
-    init_db()
+    # Only create tables when a command will actually run (not during shell
+    # completion, which parses resiliently)
+    if ctx.invoked_subcommand and not ctx.resilient_parsing:
+        init_db()
 
 
 @app.command()
@@ -76,6 +76,23 @@ def test_analytics_habits_periodicity_filter(session: Session, active_profile: P
     assert 'Weekly Habit' not in result.stdout
 
 
+def test_analytics_habits_periodicity_filter_no_match(session: Session, active_profile: Profile):
+    """Test analytics habits --periodicity with no matching habits shows friendly message."""
+    habit = Habit(
+        profile_id=active_profile.id,
+        name='Weekly Habit',
+        periodicity=Periodicity.WEEKLY,
+        is_active=True,
+    )
+    session.add(habit)
+    session.commit()
+
+    result = runner.invoke(cli, ['habits', '--periodicity', 'daily'])
+    assert result.exit_code == 0
+    assert 'No habits found' in result.stdout
+    assert 'Weekly Habit' not in result.stdout
+
+
 def test_analytics_habits_invalid_periodicity(session: Session, active_profile: Profile):
     """Test analytics habits with invalid periodicity shows error."""
     result = runner.invoke(cli, ['habits', '--periodicity', 'invalid'])
@@ -1,6 +1,8 @@
+from collections.abc import Generator
 from datetime import datetime
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
+import pytest
 from sqlmodel import Session, select
 from typer.testing import CliRunner
 
@@ -10,12 +12,30 @@ from src.core.models import Completion, Habit, Periodicity, Profile, XPEvent
 runner = CliRunner()
 
 
-def test_list_habits_no_active_profile(session: Session):
-    """Test that listing habits with no active profile shows friendly guidance."""
-    result = runner.invoke(cli, ["list"])
-    assert result.exit_code == 0
-    assert "No active profile set" in result.stdout
-    assert "profile switch" in result.stdout
+@pytest.fixture
+def mock_questionary_select() -> Generator[MagicMock]:
+    """Patches questionary.select; set `.return_value.ask.return_value` to the choice."""
+    with patch("questionary.select") as mock_select:
+        yield mock_select
+
+
+@pytest.mark.parametrize(
+    ("args", "exit_code", "expected"),
+    [
+        (["list"], 0, ["No active profile set", "profile switch"]),
+        (["create", "Test", "--periodicity", "daily"], 1, ["No active profile"]),
+        (["due"], 0, ["No active profile set"]),
+    ],
+    ids=["list", "create", "due"],
+)
+def test_habit_commands_no_active_profile(
+    session: Session, args: list[str], exit_code: int, expected: list[str]
+):
+    """Test that habit commands with no active profile show friendly guidance."""
+    result = runner.invoke(cli, args)
+    assert result.exit_code == exit_code
+    for text in expected:
+        assert text in result.stdout
 
 
 def test_create_habit_non_interactive(session: Session, active_profile: Profile):
@@ -30,24 +50,18 @@ def test_create_habit_non_interactive(session: Session, active_profile: Profile)
     assert habit.periodicity == Periodicity.DAILY
 
 
-def test_create_habit_interactive(session: Session, active_profile: Profile):
+def test_create_habit_interactive(
+    session: Session, active_profile: Profile, mock_questionary_select: MagicMock
+):
     """Test creating a habit interactively."""
     # Simulate: enter name "Read", select "daily" periodicity
-    mock_select = patch("src.cli.habit.questionary.select")
-    with patch("src.cli.habit.Prompt.ask", return_value="Read"), mock_select as mock_select_obj:
-        mock_select_obj.return_value.ask.return_value = "daily"
+    mock_questionary_select.return_value.ask.return_value = "daily"
+    with patch("rich.prompt.Prompt.ask", return_value="Read"):
         result = runner.invoke(cli, ["create"])
         assert result.exit_code == 0
         assert "Habit 'Read' created successfully!" in result.stdout
 
 
-def test_create_habit_no_active_profile(session: Session):
-    """Test creating a habit with no active profile."""
-    result = runner.invoke(cli, ["create", "Test", "--periodicity", "daily"])
-    assert result.exit_code == 1
-    assert "No active profile" in result.stdout
-
-
 def test_list_habits(session: Session, active_profile: Profile):
     """Test listing habits."""
     habit1 = Habit(profile_id=active_profile.id, name="Habit 1", periodicity=Periodicity.DAILY)
@@ -111,19 +125,19 @@ def test_complete_habit_already_completed(session: Session, active_profile: Prof
     assert "already been completed" in result.stdout
 
 
-def test_complete_habit_interactive(session: Session, active_profile: Profile):
+def test_complete_habit_interactive(
+    session: Session, active_profile: Profile, mock_questionary_select: MagicMock
+):
     """Test completing a habit interactively."""
     habit = Habit(profile_id=active_profile.id, name="Exercise", periodicity=Periodicity.DAILY)
     session.add(habit)
     session.commit()
 
-    mock_select = patch("src.cli.habit.questionary.select")
-    with mock_select as mock_select_obj:
-        mock_select_obj.return_value.ask.return_value = habit.id
-        result = runner.invoke(cli, ["complete"])
-        assert result.exit_code == 0
-        assert "completed for this period!" in result.stdout
-        assert "+1 XP" in result.stdout
+    mock_questionary_select.return_value.ask.return_value = habit.id
+    result = runner.invoke(cli, ["complete"])
+    assert result.exit_code == 0
+    assert "completed for this period!" in result.stdout
+    assert "+1 XP" in result.stdout
 
 
 def test_complete_habit_awards_xp(session: Session, active_profile: Profile):
@@ -136,12 +150,11 @@ def test_complete_habit_awards_xp(session: Session, active_profile: Profile):
     assert result.exit_code == 0
 
     # Verify XP event was created
-    xp_events = list(session.exec(
+    xp_event = session.exec(
         select(XPEvent).where(XPEvent.profile_id == active_profile.id)
-    ))
-    assert len(xp_events) == 1
-    assert xp_events[0].amount == 1
-    assert xp_events[0].reason == 'HABIT_COMPLETION'
+    ).one()
+    assert xp_event.amount == 1
+    assert xp_event.reason == 'HABIT_COMPLETION'
 
 
 def test_archive_habit(session: Session, active_profile: Profile):
@@ -175,18 +188,18 @@ def test_archive_habit_force(session: Session, active_profile: Profile):
     assert db_habit.is_active is False
 
 
-def test_archive_habit_interactive(session: Session, active_profile: Profile):
+def test_archive_habit_interactive(
+    session: Session, active_profile: Profile, mock_questionary_select: MagicMock
+):
     """Test archiving a habit interactively."""
     habit = Habit(profile_id=active_profile.id, name="To Archive", periodicity=Periodicity.DAILY)
     session.add(habit)
     session.commit()
 
-    mock_select = patch("src.cli.habit.questionary.select")
-    with mock_select as mock_select_obj:
-        mock_select_obj.return_value.ask.return_value = habit.id
-        result = runner.invoke(cli, ["archive"], input="y\n")
-        assert result.exit_code == 0
-        assert "archived" in result.stdout
+    mock_questionary_select.return_value.ask.return_value = habit.id
+    result = runner.invoke(cli, ["archive"], input="y\n")
+    assert result.exit_code == 0
+    assert "archived" in result.stdout
 
 
 def test_due_habits(session: Session, active_profile: Profile):
@@ -227,13 +240,6 @@ def test_due_habits_all_completed(session: Session, active_profile: Profile):
     assert "All habits are completed" in result.stdout or "Great job" in result.stdout
 
 
-def test_due_habits_no_active_profile(session: Session):
-    """Test listing due habits with no active profile."""
-    result = runner.invoke(cli, ["due"])
-    assert result.exit_code == 0
-    assert "No active profile set" in result.stdout
-
-
 def test_complete_habit_shows_milestone_message(session: Session, active_profile: Profile):
     """Test that completing a habit at milestone threshold shows milestone message."""
     from datetime import datetime as real_datetime
@@ -24,16 +24,16 @@ def test_overview_shows_due_habits_and_xp(session: Session, active_profile: Prof
     # Create a completed habit
     habit2 = Habit(profile_id=active_profile.id, name="Completed Habit", periodicity=Periodicity.DAILY)
     session.add_all([habit1, habit2])
-    session.commit()
+    session.flush()
 
     # Complete habit2
     today = datetime.now()
     period_key = today.date().isoformat()
     completion = Completion(habit_id=habit2.id, completed_at=today, period_key=period_key)
     session.add(completion)
-    session.commit()
+    session.flush()
 
-    # Add XP for the completion
+    # Add XP for the completion and commit the whole setup at once
     xp_event = XPEvent(
         profile_id=active_profile.id,
         amount=1,
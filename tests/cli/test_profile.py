@@ -1,3 +1,4 @@
+from collections.abc import Generator
 from unittest.mock import patch
 
 from sqlmodel import Session, select
@@ -35,7 +36,7 @@ def test_create_existing_profile(session: Session):
 
     # We patch Prompt.ask to return "newuser" when called
     # We still provide input="n\n" for the Confirm.ask at the end
-    with patch("src.cli.profile.Prompt.ask", return_value="newuser"):
+    with patch("rich.prompt.Prompt.ask", return_value="newuser"):
         result = runner.invoke(cli, ["create", "existing"], input="n\n")
 
     assert "Profile 'existing' already exists" in result.stdout
@@ -139,3 +140,20 @@ def test_me_with_active_profile(session: Session):
     result = runner.invoke(cli, ["me"])
     assert result.exit_code == 0
     assert "Active profile: activeuser" in result.stdout
+
+
+def test_command_closes_its_session(session: Session):
+    """Test that the per-invocation session is closed when the command finishes."""
+    closed: list[bool] = []
+
+    def get_tracked_session() -> Generator[Session]:
+        try:
+            yield session
+        finally:
+            closed.append(True)
+
+    with patch("src.cli._shared.get_session", new=get_tracked_session):
+        result = runner.invoke(cli, ["list"])
+
+    assert result.exit_code == 0
+    assert closed == [True]
@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 
+import pytest
 from sqlmodel import Session
 from typer.testing import CliRunner
 
@@ -9,12 +10,22 @@ from src.core.models import Completion, Habit, Periodicity, Profile, XPEvent
 runner = CliRunner()
 
 
-def test_xp_status_no_active_profile(session: Session):
-    """Test that xp status with no active profile shows friendly guidance."""
-    result = runner.invoke(cli, ["status"])
+@pytest.mark.parametrize(
+    ("args", "expected"),
+    [
+        (["status"], ["No active profile", "profile switch"]),
+        (["log"], ["No active profile"]),
+    ],
+    ids=["status", "log"],
+)
+def test_xp_commands_no_active_profile(
+    session: Session, args: list[str], expected: list[str]
+):
+    """Test that xp commands with no active profile show friendly guidance."""
+    result = runner.invoke(cli, args)
     assert result.exit_code == 1
-    assert "No active profile" in result.stdout
-    assert "profile switch" in result.stdout
+    for text in expected:
+        assert text in result.stdout
 
 
 def test_xp_status_shows_totals(session: Session, active_profile: Profile):
@@ -48,13 +59,6 @@ def test_xp_status_level_2(session: Session, active_profile: Profile):
     assert "Level: 2" in result.stdout
 
 
-def test_xp_log_no_active_profile(session: Session):
-    """Test that xp log with no active profile shows friendly guidance."""
-    result = runner.invoke(cli, ["log"])
-    assert result.exit_code == 1
-    assert "No active profile" in result.stdout
-
-
 def test_xp_log_shows_events(session: Session, active_profile: Profile):
     """Test that xp log prints rows after completions."""
     habit = Habit(profile_id=active_profile.id, name="Exercise", periodicity=Periodicity.DAILY)
@@ -95,25 +99,28 @@ def test_xp_log_limit(session: Session, active_profile: Profile):
 
     # Create 5 completions and XP events with different period keys
     base_date = datetime.now().date()
-    for i in range(5):
-        completion_date = base_date - timedelta(days=i)
-        completion = Completion(
+    completions = [
+        Completion(
             habit_id=habit.id,
             completed_at=datetime.now(),
-            period_key=completion_date.isoformat(),
+            period_key=(base_date - timedelta(days=i)).isoformat(),
         )
-        session.add(completion)
-        session.commit()
+        for i in range(5)
+    ]
+    session.add_all(completions)
+    session.flush()
 
-        xp_event = XPEvent(
+    session.add_all(
+        XPEvent(
             profile_id=active_profile.id,
             amount=1,
             reason='HABIT_COMPLETION',
             habit_id=habit.id,
             completion_id=completion.id,
         )
-        session.add(xp_event)
-        session.commit()
+        for completion in completions
+    )
+    session.commit()
 
     result = runner.invoke(cli, ["log", "--limit", "3"])
     assert result.exit_code == 0
@@ -2,37 +2,85 @@ from collections.abc import Generator
 from unittest.mock import patch
 
 import pytest
+import typer
+from sqlalchemy import Engine, event
+from sqlalchemy.pool import StaticPool
 from sqlmodel import Session, SQLModel, create_engine
 
 from src.core.models import AppState, Profile
 
 
-@pytest.fixture(name="session")
-def session_fixture() -> Generator[Session]:
+@pytest.fixture(name="engine", scope="session")
+def engine_fixture() -> Generator[Engine]:
     """
-    Creates an in-memory SQLite database and yields a session.
+    Creates a single in-memory SQLite database (schema built once) for the test run.
     """
-    engine = create_engine("sqlite:///:memory:")
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    # Let SQLAlchemy emit BEGIN itself so SAVEPOINTs work with pysqlite
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, _connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
     SQLModel.metadata.create_all(engine)
-    with Session(engine) as session:
-        yield session
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(name="session")
+def session_fixture(engine: Engine) -> Generator[Session]:
+    """
+    Yields a session inside a transaction that is rolled back after the test.
+
+    Commits made by the code under test only release SAVEPOINTs, so every test
+    starts from an empty database without recreating the schema.
+    """
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        with Session(
+            bind=connection,
+            join_transaction_mode="create_savepoint",
+            expire_on_commit=False,
+        ) as session:
+            yield session
+        transaction.rollback()
+
+
+@pytest.fixture(name="cli_app", scope="session")
+def cli_app_fixture() -> typer.Typer:
+    """
+    Imports the root Typer app once, on first use, for the whole test run.
+    """
+    from main import app
+
+    return app
 
 
 @pytest.fixture(autouse=True)
-def mock_get_session(session: Session):
-    """
-    Patches the get_session function in CLI modules to return the test session.
-    """
-    # Use side_effect to return a new iterator each time get_session is called
-    with patch("src.cli.profile.get_session", side_effect=lambda: iter([session])), patch(
-        "src.cli.habit.get_session", side_effect=lambda: iter([session])
-    ), patch(
-        "src.cli.xp.get_session", side_effect=lambda: iter([session])
-    ), patch(
-        "src.cli.overview.get_session", side_effect=lambda: iter([session])
-    ), patch(
-        "src.cli.analytics.get_session", side_effect=lambda: iter([session])
-    ):
+def mock_get_session(request: pytest.FixtureRequest):
+    """
+    Patches the get_session function used by the CLI contexts to return the test session.
+
+    Tests marked `no_db` skip this, so they never open a database connection.
+    """
+    if request.node.get_closest_marker("no_db"):
+        yield
+        return
+
+    session = request.getfixturevalue("session")
+
+    def get_test_session() -> Generator[Session]:
+        yield session
+
+    with patch("src.cli._shared.get_session", new=get_test_session):
         yield
 
 
@@ -40,18 +88,15 @@ def mock_get_session(session: Session):
 def active_profile_fixture(session: Session) -> Profile:
     """
     Creates a profile and sets it as the active profile in AppState.
-    
-    This fixture properly handles the commit order to ensure profile.id is available
-    before setting active_profile_id in AppState.
+
+    The profile is flushed first so profile.id is available for AppState, and
+    both rows are committed together.
     """
     profile = Profile(username="testuser")
     session.add(profile)
-    session.commit()
-    session.refresh(profile)
+    session.flush()
 
-    # Now that profile.id is set, create/update AppState
-    app_state = AppState(id=1, active_profile_id=profile.id)
-    session.add(app_state)
+    session.add(AppState(id=1, active_profile_id=profile.id))
     session.commit()
 
     return profile
@@ -2,6 +2,8 @@
 
 from datetime import datetime
 
+import pytest
+
 from src.core.analytics.dto import CompletionDTO, HabitDTO
 from src.core.analytics.functions import (
     filter_habits_by_periodicity,
@@ -11,138 +13,121 @@ from src.core.analytics.functions import (
 )
 from src.core.models import Periodicity
 
+pytestmark = pytest.mark.no_db
 
-def test_list_all_habits():
-    """Test that list_all_habits returns all habits."""
-    habits = [
-        HabitDTO(
-            id=1,
-            name='Habit 1',
-            periodicity=Periodicity.DAILY,
-            created_at=datetime.now(),
-            is_active=True,
-        ),
-        HabitDTO(
-            id=2,
-            name='Habit 2',
-            periodicity=Periodicity.WEEKLY,
-            created_at=datetime.now(),
-            is_active=True,
-        ),
+# Fixed creation timestamp; no analytics function reads created_at
+_NOW = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def make_daily_completions(habit_id: int, days: list[int]) -> list[CompletionDTO]:
+    """Build daily completions for a habit on the given days of January 2025."""
+    return [
+        CompletionDTO(
+            habit_id=habit_id,
+            completed_at=datetime(2025, 1, day),
+            period_key=f'2025-01-{day:02d}',
+        )
+        for day in days
     ]
-    result = list_all_habits(habits)
-    assert result == habits
-    assert len(result) == 2
 
 
-def test_filter_habits_by_periodicity():
-    """Test filtering habits by periodicity."""
-    habits = [
+def week_key(when: datetime) -> str:
+    """Return the WEEKLY period key (YYYY-Www, ISO week) containing `when`."""
+    iso_year, iso_week, _ = when.isocalendar()
+    return f'{iso_year}-W{iso_week:02d}'
+
+
+def make_weekly_completions(
+    habit_id: int, completed_at: list[datetime]
+) -> list[CompletionDTO]:
+    """Build weekly completions for a habit at the given completion times."""
+    return [
+        CompletionDTO(habit_id=habit_id, completed_at=when, period_key=week_key(when))
+        for when in completed_at
+    ]
+
+
+@pytest.fixture(name='sample_habits', scope='module')
+def sample_habits_fixture() -> tuple[HabitDTO, ...]:
+    """
+    Provides a shared, immutable set of daily and weekly habits.
+    """
+    return (
         HabitDTO(
             id=1,
             name='Daily Habit',
             periodicity=Periodicity.DAILY,
-            created_at=datetime.now(),
+            created_at=_NOW,
             is_active=True,
         ),
         HabitDTO(
             id=2,
             name='Weekly Habit',
             periodicity=Periodicity.WEEKLY,
-            created_at=datetime.now(),
+            created_at=_NOW,
             is_active=True,
         ),
         HabitDTO(
             id=3,
             name='Another Daily',
             periodicity=Periodicity.DAILY,
-            created_at=datetime.now(),
+            created_at=_NOW,
             is_active=True,
         ),
-    ]
+    )
+
+
+def test_list_all_habits(sample_habits: tuple[HabitDTO, ...]):
+    """Test that list_all_habits returns all habits."""
+    result = list_all_habits(sample_habits)
+    assert result == list(sample_habits)
+    assert len(result) == 3
 
-    daily_habits = filter_habits_by_periodicity(habits, Periodicity.DAILY)
+
+def test_filter_habits_by_periodicity(sample_habits: tuple[HabitDTO, ...]):
+    """Test filtering habits by periodicity."""
+    daily_habits = filter_habits_by_periodicity(sample_habits, Periodicity.DAILY)
     assert len(daily_habits) == 2
     assert all(h.periodicity == Periodicity.DAILY for h in daily_habits)
     assert daily_habits[0].name == 'Daily Habit'
     assert daily_habits[1].name == 'Another Daily'
 
-    weekly_habits = filter_habits_by_periodicity(habits, Periodicity.WEEKLY)
+    weekly_habits = filter_habits_by_periodicity(sample_habits, Periodicity.WEEKLY)
     assert len(weekly_habits) == 1
     assert weekly_habits[0].name == 'Weekly Habit'
 
 
-def test_longest_streak_for_habit_no_completions():
-    """Test longest streak for habit with no completions returns 0."""
-    habit = HabitDTO(
-        id=1,
-        name='Test Habit',
-        periodicity=Periodicity.DAILY,
-        created_at=datetime.now(),
-        is_active=True,
-    )
-    completions: list[CompletionDTO] = []
-    streak = longest_streak_for_habit(habit, completions)
-    assert streak == 0
-
-
-def test_longest_streak_for_habit_single_completion():
-    """Test longest streak for habit with single completion returns 1."""
-    habit = HabitDTO(
-        id=1,
-        name='Test Habit',
-        periodicity=Periodicity.DAILY,
-        created_at=datetime.now(),
-        is_active=True,
-    )
-    completions = [
-        CompletionDTO(
-            habit_id=1,
-            completed_at=datetime(2025, 1, 1),
-            period_key='2025-01-01',
-        ),
-    ]
-    streak = longest_streak_for_habit(habit, completions)
-    assert streak == 1
-
-
-def test_longest_streak_for_habit_consecutive_days():
-    """Test longest streak with consecutive daily completions."""
+@pytest.mark.parametrize(
+    ('days', 'expected'),
+    [
+        ([], 0),
+        ([1], 1),
+        ([1, 2, 3], 3),
+        ([1, 2, 4, 5, 6], 3),  # Max of [1,2] (2) and [4,5,6] (3)
+        ([1, 2, 1], 2),  # Duplicates are deduplicated
+    ],
+    ids=['no_completions', 'single', 'consecutive', 'broken', 'duplicates'],
+)
+def test_longest_streak_for_habit_daily(days: list[int], expected: int):
+    """Test longest streak calculation for daily habits."""
     habit = HabitDTO(
         id=1,
         name='Daily Habit',
         periodicity=Periodicity.DAILY,
-        created_at=datetime.now(),
+        created_at=_NOW,
         is_active=True,
     )
-    completions = [
-        CompletionDTO(
-            habit_id=1,
-            completed_at=datetime(2025, 1, 1),
-            period_key='2025-01-01',
-        ),
-        CompletionDTO(
-            habit_id=1,
-            completed_at=datetime(2025, 1, 2),
-            period_key='2025-01-02',
-        ),
-        CompletionDTO(
-            habit_id=1,
-            completed_at=datetime(2025, 1, 3),
-            period_key='2025-01-03',
-        ),
-    ]
-    streak = longest_streak_for_habit(habit, completions)
-    assert streak == 3
+    streak = longest_streak_for_habit(habit, make_daily_completions(1, days))
+    assert streak == expected
 
 
-def test_longest_streak_for_habit_broken_streak():
-    """Test longest streak picks max run when streak is broken."""
+def test_longest_streak_for_habit_skips_invalid_period_keys():
+    """Test that malformed period keys are ignored rather than raising."""
     habit = HabitDTO(
         id=1,
-        name='Daily Habit',
+        name='Test Habit',
         periodicity=Periodicity.DAILY,
-        created_at=datetime.now(),
+        created_at=_NOW,
         is_active=True,
     )
     completions = [
@@ -154,114 +139,39 @@ def test_longest_streak_for_habit_broken_streak():
         CompletionDTO(
             habit_id=1,
             completed_at=datetime(2025, 1, 2),
-            period_key='2025-01-02',
-        ),
-        CompletionDTO(
-            habit_id=1,
-            completed_at=datetime(2025, 1, 4),  # Skip day 3
-            period_key='2025-01-04',
-        ),
-        CompletionDTO(
-            habit_id=1,
-            completed_at=datetime(2025, 1, 5),
-            period_key='2025-01-05',
-        ),
-        CompletionDTO(
-            habit_id=1,
-            completed_at=datetime(2025, 1, 6),
-            period_key='2025-01-06',
-        ),
-    ]
-    streak = longest_streak_for_habit(habit, completions)
-    assert streak == 3  # Max of [1,2] (2) and [4,5,6] (3)
-
-
-def test_longest_streak_for_habit_duplicates():
-    """Test that duplicates in input are handled correctly."""
-    habit = HabitDTO(
-        id=1,
-        name='Daily Habit',
-        periodicity=Periodicity.DAILY,
-        created_at=datetime.now(),
-        is_active=True,
-    )
-    completions = [
-        CompletionDTO(
-            habit_id=1,
-            completed_at=datetime(2025, 1, 1),
-            period_key='2025-01-01',
+            period_key='not-a-date',
         ),
         CompletionDTO(
             habit_id=1,
             completed_at=datetime(2025, 1, 2),
             period_key='2025-01-02',
         ),
-        CompletionDTO(
-            habit_id=1,
-            completed_at=datetime(2025, 1, 1),  # Duplicate
-            period_key='2025-01-01',
-        ),
     ]
     streak = longest_streak_for_habit(habit, completions)
-    assert streak == 2  # Should deduplicate and still find streak of 2
+    assert streak == 2
 
 
-def test_longest_streak_for_habit_weekly():
+@pytest.mark.parametrize(
+    ('completed_at', 'expected'),
+    [
+        # Max of [W01, W02] (2) and [W04] (1)
+        ([datetime(2025, 1, 1), datetime(2025, 1, 8), datetime(2025, 1, 22)], 2),
+        # 2025-W52 ends Dec 28, 2026-W01 starts Dec 29
+        ([datetime(2025, 12, 23), datetime(2025, 12, 30)], 2),
+    ],
+    ids=['gap', 'across_year_boundary'],
+)
+def test_longest_streak_for_habit_weekly(completed_at: list[datetime], expected: int):
     """Test longest streak calculation for weekly habits."""
     habit = HabitDTO(
         id=1,
         name='Weekly Habit',
         periodicity=Periodicity.WEEKLY,
-        created_at=datetime.now(),
+        created_at=_NOW,
         is_active=True,
     )
-    completions = [
-        CompletionDTO(
-            habit_id=1,
-            completed_at=datetime(2025, 1, 6),  # Week 1 (Monday is Jan 6)
-            period_key='2025-W01',
-        ),
-        CompletionDTO(
-            habit_id=1,
-            completed_at=datetime(2025, 1, 13),  # Week 2
-            period_key='2025-W02',
-        ),
-        CompletionDTO(
-            habit_id=1,
-            completed_at=datetime(2025, 1, 27),  # Week 4 (skip week 3)
-            period_key='2025-W04',
-        ),
-    ]
-    streak = longest_streak_for_habit(habit, completions)
-    assert streak == 2  # Max of [W01, W02] (2) and [W04] (1)
-
-
-def test_longest_streak_weekly_across_year_boundary():
-    """Test weekly streak calculation across year boundary."""
-    habit = HabitDTO(
-        id=1,
-        name='Weekly Habit',
-        periodicity=Periodicity.WEEKLY,
-        created_at=datetime.now(),
-        is_active=True,
-    )
-    completions = [
-        CompletionDTO(
-            habit_id=1,
-            completed_at=datetime(2025, 12, 23),  # Week 52 of 2025
-            period_key='2025-W52',
-        ),
-        CompletionDTO(
-            habit_id=1,
-            completed_at=datetime(2025, 12, 30),  # Week 1 of 2026 (ISO week)
-            period_key='2026-W01',
-        ),
-    ]
-    streak = longest_streak_for_habit(habit, completions)
-    # Should recognize consecutive weeks even across year boundary
-    # Week 52 of 2025 ends Dec 28, Week 1 of 2026 starts Dec 29
-    # These should be consecutive (7 days apart)
-    assert streak == 2
+    streak = longest_streak_for_habit(habit, make_weekly_completions(1, completed_at))
+    assert streak == expected
 
 
 def test_longest_streak_for_habit_filters_by_habit_id():
@@ -270,7 +180,7 @@ def test_longest_streak_for_habit_filters_by_habit_id():
         id=1,
         name='Habit 1',
         periodicity=Periodicity.DAILY,
-        created_at=datetime.now(),
+        created_at=_NOW,
         is_active=True,
     )
     completions = [
@@ -312,7 +222,7 @@ def test_longest_streak_across_habits_no_completions():
             id=1,
             name='Habit 1',
             periodicity=Periodicity.DAILY,
-            created_at=datetime.now(),
+            created_at=_NOW,
             is_active=True,
         ),
     ]
@@ -331,14 +241,14 @@ def test_longest_streak_across_habits_picks_best():
             id=1,
             name='Habit 1',
             periodicity=Periodicity.DAILY,
-            created_at=datetime.now(),
+            created_at=_NOW,
             is_active=True,
         ),
         HabitDTO(
             id=2,
             name='Habit 2',
             periodicity=Periodicity.DAILY,
-            created_at=datetime.now(),
+            created_at=_NOW,
             is_active=True,
         ),
     ]
@@ -385,14 +295,14 @@ def test_longest_streak_across_habits_tie_breaking():
             id=2,
             name='Habit 2',
             periodicity=Periodicity.DAILY,
-            created_at=datetime.now(),
+            created_at=_NOW,
             is_active=True,
         ),
         HabitDTO(
             id=1,
             name='Habit 1',
             periodicity=Periodicity.DAILY,
-            created_at=datetime.now(),
+            created_at=_NOW,
             is_active=True,
         ),
     ]
@@ -423,3 +333,82 @@ def test_longest_streak_across_habits_tie_breaking():
     assert result.length == 2
     assert result.habit_id == 1  # Lower ID wins in tie
     assert result.habit_name == 'Habit 1'
+
+
+def test_longest_streak_across_habits_ignores_unknown_habit_completions():
+    """Test that completions of habits not in the sequence are ignored."""
+    habits = [
+        HabitDTO(
+            id=1,
+            name='Habit 1',
+            periodicity=Periodicity.WEEKLY,
+            created_at=_NOW,
+            is_active=True,
+        ),
+    ]
+    completions = [
+        CompletionDTO(
+            habit_id=1,
+            completed_at=datetime(2025, 1, 6),
+            period_key=week_key(datetime(2025, 1, 6)),
+        ),
+        # Habit 99 has a longer streak but is not part of the sequence
+        CompletionDTO(
+            habit_id=99,
+            completed_at=datetime(2025, 1, 1),
+            period_key='2025-01-01',
+        ),
+        CompletionDTO(
+            habit_id=99,
+            completed_at=datetime(2025, 1, 2),
+            period_key='2025-01-02',
+        ),
+    ]
+    result = longest_streak_across_habits(habits, completions)
+    assert result.length == 1
+    assert result.habit_id == 1
+    assert result.periodicity == Periodicity.WEEKLY
+
+
+def test_longest_streak_across_habits_more_completions_shorter_streak():
+    """Test that a habit with fewer completions can still hold the longest streak."""
+    habits = [
+        HabitDTO(
+            id=1,
+            name='Scattered',
+            periodicity=Periodicity.DAILY,
+            created_at=_NOW,
+            is_active=True,
+        ),
+        HabitDTO(
+            id=2,
+            name='Consistent',
+            periodicity=Periodicity.DAILY,
+            created_at=_NOW,
+            is_active=True,
+        ),
+    ]
+    completions = [
+        # Habit 1: four completions, none consecutive
+        *(
+            CompletionDTO(
+                habit_id=1,
+                completed_at=datetime(2025, 1, day),
+                period_key=f'2025-01-{day:02d}',
+            )
+            for day in (1, 3, 5, 7)
+        ),
+        # Habit 2: three consecutive completions
+        *(
+            CompletionDTO(
+                habit_id=2,
+                completed_at=datetime(2025, 2, day),
+                period_key=f'2025-02-{day:02d}',
+            )
+            for day in (1, 2, 3)
+        ),
+    ]
+    result = longest_streak_across_habits(habits, completions)
+    assert result.length == 3
+    assert result.habit_id == 2
+    assert result.habit_name == 'Consistent'
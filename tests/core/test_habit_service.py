@@ -1,7 +1,9 @@
+from collections.abc import Generator
 from datetime import datetime
+from pathlib import Path
 
 import pytest
-from sqlmodel import Session
+from sqlmodel import Session, SQLModel, create_engine, select
 
 from src.core.habit import (
     ActiveProfileRequired,
@@ -11,7 +13,7 @@ from src.core.habit import (
     HabitNotFound,
     HabitService,
 )
-from src.core.models import Completion, Habit, Periodicity, Profile, XPEvent
+from src.core.models import AppState, Completion, Habit, Periodicity, Profile, XPEvent
 from src.core.xp import XPService
 
 
@@ -72,7 +74,7 @@ def test_list_habits_scoped_to_active_profile(session: Session, active_profile:
     profile1 = active_profile
     profile2 = Profile(username="user2")
     session.add(profile2)
-    session.commit()
+    session.flush()
 
     service = HabitService(lambda: iter([session]))
 
@@ -91,6 +93,26 @@ def test_list_habits_scoped_to_active_profile(session: Session, active_profile:
     assert habit3.id not in [h.id for h in habits]
 
 
+def test_get_habit_scoped_to_active_profile(session: Session, active_profile: Profile):
+    """Test that get_habit only returns habits of the active profile."""
+    other = Profile(username="user2")
+    session.add(other)
+    session.flush()
+
+    service = HabitService(lambda: iter([session]))
+
+    own = Habit(profile_id=active_profile.id, name="Own", periodicity=Periodicity.DAILY)
+    foreign = Habit(profile_id=other.id, name="Foreign", periodicity=Periodicity.DAILY)
+    session.add_all([own, foreign])
+    session.commit()
+
+    habit = service.get_habit(own.id)
+    assert habit is not None
+    assert habit.name == "Own"
+    assert service.get_habit(foreign.id) is None
+    assert service.get_habit(999) is None
+
+
 def test_list_habits_active_only(session: Session, active_profile: Profile):
     """Test that list_habits filters by active status."""
     service = HabitService(lambda: iter([session]))
@@ -208,7 +230,7 @@ def test_get_due_habits(session: Session, active_profile: Profile):
     habit1 = Habit(profile_id=active_profile.id, name="Due", periodicity=Periodicity.DAILY)
     habit2 = Habit(profile_id=active_profile.id, name="Completed", periodicity=Periodicity.DAILY)
     session.add_all([habit1, habit2])
-    session.commit()
+    session.flush()
 
     # Complete habit2
     today = datetime.now()
@@ -222,6 +244,66 @@ def test_get_due_habits(session: Session, active_profile: Profile):
     assert due_habits[0].id == habit1.id
 
 
+def test_get_due_habits_matches_current_period_per_periodicity(
+    session: Session, active_profile: Profile
+):
+    """Test that due habits are matched against their own periodicity's period key."""
+    service = HabitService(lambda: iter([session]))
+
+    daily = Habit(profile_id=active_profile.id, name="Daily", periodicity=Periodicity.DAILY)
+    weekly_done = Habit(profile_id=active_profile.id, name="Weekly Done", periodicity=Periodicity.WEEKLY)
+    weekly_due = Habit(profile_id=active_profile.id, name="Weekly Due", periodicity=Periodicity.WEEKLY)
+    session.add_all([daily, weekly_done, weekly_due])
+    session.flush()
+
+    when = datetime(2025, 1, 8, 9, 0)
+    session.add_all(
+        [
+            # Yesterday's completion does not cover today's daily period
+            Completion(habit_id=daily.id, completed_at=datetime(2025, 1, 7), period_key="2025-01-07"),
+            Completion(habit_id=weekly_done.id, completed_at=datetime(2025, 1, 6), period_key="2025-W02"),
+            # Last week's completion does not cover this week
+            Completion(habit_id=weekly_due.id, completed_at=datetime(2025, 1, 1), period_key="2025-W01"),
+        ]
+    )
+    session.commit()
+
+    due_habits = service.get_due_habits(when)
+    assert [h.id for h in due_habits] == [daily.id, weekly_due.id]
+
+
+def test_iter_completions_filters_by_habit(session: Session, active_profile: Profile):
+    """Test that iter_completions streams only the requested habits' completions."""
+    service = HabitService(lambda: iter([session]))
+
+    habit1 = Habit(profile_id=active_profile.id, name="First", periodicity=Periodicity.DAILY)
+    habit2 = Habit(profile_id=active_profile.id, name="Second", periodicity=Periodicity.DAILY)
+    session.add_all([habit1, habit2])
+    session.flush()
+    session.add_all(
+        [
+            Completion(habit_id=habit1.id, completed_at=datetime(2025, 1, 2), period_key="2025-01-02"),
+            Completion(habit_id=habit1.id, completed_at=datetime(2025, 1, 1), period_key="2025-01-01"),
+            Completion(habit_id=habit2.id, completed_at=datetime(2025, 1, 1), period_key="2025-01-01"),
+        ]
+    )
+    session.commit()
+
+    completions = service.iter_completions(habit_ids=[habit1.id])
+    assert [(c.habit_id, c.period_key) for c in completions] == [
+        (habit1.id, "2025-01-01"),
+        (habit1.id, "2025-01-02"),
+    ]
+
+
+def test_iter_completions_requires_active_profile(session: Session):
+    """Test that iter_completions checks the active profile before iteration."""
+    service = HabitService(lambda: iter([session]))
+
+    with pytest.raises(ActiveProfileRequired):
+        service.iter_completions()
+
+
 def test_get_due_habits_requires_active_profile(session: Session):
     """Test that get_due_habits requires an active profile."""
     service = HabitService(lambda: iter([session]))
@@ -237,32 +319,29 @@ def test_complete_habit_awards_xp_when_xp_service_injected(session: Session, act
 
     habit = Habit(profile_id=active_profile.id, name="Exercise", periodicity=Periodicity.DAILY)
     session.add(habit)
-    session.commit()
+    session.flush()
 
     completion, _ = habit_service.complete_habit(habit.id)
 
     # Verify XP was awarded
-    from sqlmodel import select
-    xp_events = list(session.exec(
+    # one() also asserts that exactly one event exists
+    xp_event = session.exec(
         select(XPEvent).where(XPEvent.completion_id == completion.id)
-    ))
-    assert len(xp_events) == 1
-    assert xp_events[0].amount == 1
-    assert xp_events[0].reason == 'HABIT_COMPLETION'
-    assert xp_events[0].habit_id == habit.id
-    assert xp_events[0].profile_id == active_profile.id
+    ).one()
+    assert xp_event.amount == 1
+    assert xp_event.reason == 'HABIT_COMPLETION'
+    assert xp_event.habit_id == habit.id
+    assert xp_event.profile_id == active_profile.id
 
 
 def test_complete_habit_at_milestone_awards_milestone_xp(session: Session, active_profile: Profile):
     """Test that completing a habit at milestone threshold creates both completion and milestone XP."""
-    from sqlmodel import select
-
     xp_service = XPService(lambda: iter([session]))
     habit_service = HabitService(lambda: iter([session]), xp_service=xp_service)
 
     habit = Habit(profile_id=active_profile.id, name="Exercise", periodicity=Periodicity.DAILY)
     session.add(habit)
-    session.commit()
+    session.flush()
 
     # Create 2 prior completions (streak will be 3 after this complete)
     base = datetime(2025, 3, 1)
@@ -283,14 +362,45 @@ def test_complete_habit_at_milestone_awards_milestone_xp(session: Session, activ
     assert completion.period_key == '2025-03-03'
 
     # Completion XP
-    completion_xp = list(session.exec(
+    completion_xp = session.exec(
         select(XPEvent).where(XPEvent.completion_id == completion.id)
-    ))
-    assert len(completion_xp) == 1
-    assert completion_xp[0].reason == 'HABIT_COMPLETION'
-    assert completion_xp[0].amount == 1
+    ).one()
+    assert completion_xp.reason == 'HABIT_COMPLETION'
+    assert completion_xp.amount == 1
 
     # Milestone XP
     assert len(milestone_events) == 1
     assert milestone_events[0].amount == 5
     assert milestone_events[0].reason == 'MILESTONE_STREAK_3'
+
+
+def test_complete_habit_awards_milestone_with_a_session_per_call(tmp_path: Path):
+    """Test that the streak counts the new completion when the factory opens a new session per call."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'habits.db'}")
+    SQLModel.metadata.create_all(engine)
+
+    def session_factory() -> Generator[Session]:
+        with Session(engine, expire_on_commit=False) as session:
+            yield session
+
+    # Two prior daily completions; completing day 3 hits the first milestone
+    with Session(engine, expire_on_commit=False) as setup:
+        profile = Profile(username="testuser")
+        setup.add(profile)
+        setup.flush()
+        habit = Habit(profile_id=profile.id, name="Exercise", periodicity=Periodicity.DAILY)
+        setup.add_all([AppState(id=1, active_profile_id=profile.id), habit])
+        setup.flush()
+        setup.add_all(
+            [
+                Completion(habit_id=habit.id, completed_at=datetime(2025, 3, 1), period_key="2025-03-01"),
+                Completion(habit_id=habit.id, completed_at=datetime(2025, 3, 2), period_key="2025-03-02"),
+            ]
+        )
+        setup.commit()
+
+    habit_service = HabitService(session_factory, xp_service=XPService(session_factory))
+    _, milestone_events = habit_service.complete_habit(habit.id, when=datetime(2025, 3, 3))
+
+    assert [event.reason for event in milestone_events] == ["MILESTONE_STREAK_3"]
+    engine.dispose()
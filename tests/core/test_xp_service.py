@@ -1,7 +1,7 @@
 from datetime import datetime
 
 import pytest
-from sqlmodel import Session
+from sqlmodel import Session, func, select
 
 from src.core.models import Completion, Habit, Periodicity, Profile, XPEvent
 from src.core.xp import ActiveProfileRequired, XPService
@@ -30,6 +30,7 @@ def test_award_habit_completion_creates_event(session: Session, active_profile:
     assert xp_event.reason == 'HABIT_COMPLETION'
     assert xp_event.habit_id == habit.id
     assert xp_event.completion_id == completion.id
+    assert xp_event.awarded_at is not None
 
     # Verify in DB
     db_event = session.get(XPEvent, xp_event.id)
@@ -63,11 +64,37 @@ def test_award_habit_completion_idempotent(session: Session, active_profile: Pro
     assert xp_event1.id == xp_event2.id
 
     # Verify only one event exists
-    from sqlmodel import select
-    events = list(session.exec(
-        select(XPEvent).where(XPEvent.completion_id == completion.id)
-    ))
-    assert len(events) == 1
+    event_count = session.exec(
+        select(func.count()).select_from(XPEvent).where(XPEvent.completion_id == completion.id)
+    ).one()
+    assert event_count == 1
+
+
+def test_award_habit_completion_without_commit_defers_to_caller(
+    session: Session, active_profile: Profile
+):
+    """Test that commit=False only flushes, so the caller's rollback discards the event."""
+    service = XPService(lambda: iter([session]))
+
+    habit = Habit(profile_id=active_profile.id, name="Exercise", periodicity=Periodicity.DAILY)
+    session.add(habit)
+    session.commit()
+
+    completion = Completion(
+        habit_id=habit.id,
+        completed_at=datetime.now(),
+        period_key=datetime.now().date().isoformat(),
+    )
+    session.add(completion)
+    session.commit()
+
+    xp_event = service.award_habit_completion(
+        session, active_profile.id, habit.id, completion.id, commit=False
+    )
+    assert xp_event.id is not None
+
+    session.rollback()
+    assert service.get_total_xp(session, active_profile.id) == 0
 
 
 def test_get_total_xp_sums_correctly(session: Session, active_profile: Profile):
@@ -97,51 +124,52 @@ def test_get_total_xp_returns_zero_when_none(session: Session, active_profile: P
     assert total == 0
 
 
-def test_compute_level_boundary_values():
+@pytest.fixture(name="pure_xp_service", scope="module")
+def pure_xp_service_fixture() -> XPService:
+    """
+    Provides an XPService for the pure level computations (no session needed).
+    """
+    return XPService(lambda: iter([]))
+
+
+@pytest.mark.no_db
+@pytest.mark.parametrize(
+    ("total_xp", "expected_level"),
+    [
+        # Level 1: 0-9 XP
+        (0, 1),
+        (9, 1),
+        # Level 2: 10-19 XP
+        (10, 2),
+        (11, 2),
+        (19, 2),
+        # Level 3: 20-29 XP
+        (20, 3),
+        (29, 3),
+    ],
+)
+def test_compute_level_boundary_values(
+    pure_xp_service: XPService, total_xp: int, expected_level: int
+):
     """Test level computation for boundary values."""
-    service = XPService(lambda: iter([]))
-
-    # Level 1: 0-9 XP
-    assert service.compute_level(0) == 1
-    assert service.compute_level(9) == 1
-
-    # Level 2: 10-19 XP
-    assert service.compute_level(10) == 2
-    assert service.compute_level(11) == 2
-    assert service.compute_level(19) == 2
-
-    # Level 3: 20-29 XP
-    assert service.compute_level(20) == 3
-    assert service.compute_level(29) == 3
-
-
-def test_compute_level_progress():
-    """Test level progress computation."""
-    service = XPService(lambda: iter([]))
-
-    # Level 1, 0 XP into level, 10 to next
-    level, xp_into, xp_to_next = service.compute_level_progress(0)
-    assert level == 1
-    assert xp_into == 0
-    assert xp_to_next == 10
-
-    # Level 1, 9 XP into level, 1 to next
-    level, xp_into, xp_to_next = service.compute_level_progress(9)
-    assert level == 1
-    assert xp_into == 9
-    assert xp_to_next == 1
-
-    # Level 2, 0 XP into level, 10 to next
-    level, xp_into, xp_to_next = service.compute_level_progress(10)
-    assert level == 2
-    assert xp_into == 0
-    assert xp_to_next == 10
-
-    # Level 2, 5 XP into level, 5 to next
-    level, xp_into, xp_to_next = service.compute_level_progress(15)
-    assert level == 2
-    assert xp_into == 5
-    assert xp_to_next == 5
+    assert pure_xp_service.compute_level(total_xp) == expected_level
+
+
+@pytest.mark.no_db
+@pytest.mark.parametrize(
+    ("total_xp", "expected"),
+    [
+        (0, (1, 0, 10)),
+        (9, (1, 9, 1)),
+        (10, (2, 0, 10)),
+        (15, (2, 5, 5)),
+    ],
+)
+def test_compute_level_progress(
+    pure_xp_service: XPService, total_xp: int, expected: tuple[int, int, int]
+):
+    """Test level progress computation as (level, xp_into_level, xp_to_next)."""
+    assert pure_xp_service.compute_level_progress(total_xp) == expected
 
 
 def test_get_total_xp_for_active_profile_requires_active_profile(session: Session):
@@ -160,6 +188,30 @@ def test_get_level_progress_for_active_profile_requires_active_profile(session:
         service.get_level_progress_for_active_profile()
 
 
+def test_get_xp_summary_for_active_profile(session: Session, active_profile: Profile):
+    """Test that the XP summary combines total XP and level progress."""
+    service = XPService(lambda: iter([session]))
+
+    session.add_all(
+        [
+            XPEvent(profile_id=active_profile.id, amount=5, reason="MILESTONE_STREAK_3"),
+            XPEvent(profile_id=active_profile.id, amount=5, reason="MILESTONE_STREAK_7"),
+            XPEvent(profile_id=active_profile.id, amount=3, reason="HABIT_COMPLETION"),
+        ]
+    )
+    session.commit()
+
+    assert service.get_xp_summary_for_active_profile() == (13, 2, 3, 7)
+
+
+def test_get_xp_summary_for_active_profile_requires_active_profile(session: Session):
+    """Test that get_xp_summary_for_active_profile requires an active profile."""
+    service = XPService(lambda: iter([session]))
+
+    with pytest.raises(ActiveProfileRequired):
+        service.get_xp_summary_for_active_profile()
+
+
 def test_award_milestone_xp_when_streak_hits_target(session: Session, active_profile: Profile):
     """Test that awarding milestone XP gives +5 when streak hits a target."""
     service = XPService(lambda: iter([session]))
@@ -189,14 +241,15 @@ def test_award_milestone_xp_idempotent(session: Session, active_profile: Profile
     assert len(events1) == 2  # 3 and 7
     assert len(events2) == 0  # already claimed
 
-    from sqlmodel import select
-    all_milestones = list(session.exec(
-        select(XPEvent).where(
+    milestone_count = session.exec(
+        select(func.count())
+        .select_from(XPEvent)
+        .where(
             XPEvent.habit_id == habit.id,
             XPEvent.reason.startswith("MILESTONE_STREAK_"),
         )
-    ))
-    assert len(all_milestones) == 2
+    ).one()
+    assert milestone_count == 2
 
 
 def test_award_milestone_xp_awards_next_milestone_later(session: Session, active_profile: Profile):
@@ -1,19 +1,18 @@
+import typer
 from typer.testing import CliRunner
 
-from main import app
-
 runner = CliRunner()
 
 
-def test_app_exists():
+def test_app_exists(cli_app: typer.Typer):
     """Test that the app exists and is a Typer instance."""
-    assert app is not None
-    assert hasattr(app, 'command')
+    assert cli_app is not None
+    assert hasattr(cli_app, 'command')
 
 
-def test_app_help():
+def test_app_help(cli_app: typer.Typer):
     """Test that the help command works and shows the profile and habit commands."""
-    result = runner.invoke(app, ['--help'])
+    result = runner.invoke(cli_app, ['--help'])
     assert result.exit_code == 0
     assert 'profile' in result.stdout
     assert 'habit' in result.stdout